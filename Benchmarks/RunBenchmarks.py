@@ -0,0 +1,250 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+AbsoluteDirectoryPath = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if sys.path[0] != AbsoluteDirectoryPath:
+    sys.path.insert(0, AbsoluteDirectoryPath)
+
+
+# Scenario Generation
+def WriteRandomFile(Path, Size, RandomGenerator):
+    with open(Path, "wb") as OpenedFile:
+        Remaining = Size
+        while Remaining > 0:
+            ChunkSize = min(Remaining, 4194304)
+            OpenedFile.write(RandomGenerator.randbytes(ChunkSize))
+            Remaining -= ChunkSize
+
+
+def FlipByte(Path, Offset):
+    with open(Path, "r+b") as OpenedFile:
+        OpenedFile.seek(Offset)
+        Byte = OpenedFile.read(1)
+        OpenedFile.seek(Offset)
+        OpenedFile.write(bytes([Byte[0] ^ 0xFF]))
+
+
+def CreateScenarios(WorkDirectory, Scale):
+    Scenarios = {}
+    RandomGenerator = random.Random(0)
+
+    def CreateScenario(Name, PopulateInput, Difference=None):
+        InputOne = os.path.join(WorkDirectory, Name, "One", Name)
+        InputTwo = os.path.join(WorkDirectory, Name, "Two", Name)
+        CompleteMarker = os.path.join(WorkDirectory, Name, "Complete")
+
+        # Reuse Scenarios Generated by an Earlier Run
+        if not os.path.isfile(CompleteMarker):
+            if os.path.isdir(os.path.join(WorkDirectory, Name)):
+                shutil.rmtree(os.path.join(WorkDirectory, Name))
+            os.makedirs(InputOne)
+            PopulateInput(InputOne)
+            shutil.copytree(InputOne, InputTwo, dirs_exist_ok=True)
+            if Difference is not None:
+                Difference(InputTwo)
+            open(CompleteMarker, "w").close()
+        Scenarios[Name] = {"InputOne": InputOne, "InputTwo": InputTwo, "Identical": Difference is None}
+
+    def PopulateTinyFiles(Input):
+        for Index in range(int(20000 * Scale)):
+            SubDirectory = os.path.join(Input, f"{Index // 1000:03}")
+            os.makedirs(SubDirectory, exist_ok=True)
+            WriteRandomFile(os.path.join(SubDirectory, f"{Index:06}.bin"), RandomGenerator.randint(1, 4096), RandomGenerator)
+
+    def PopulateHugeFiles(Input):
+        for Index in range(2):
+            WriteRandomFile(os.path.join(Input, f"{Index}.img"), int(268435456 * Scale), RandomGenerator)
+
+    def PopulateDeepNesting(Input):
+        CurrentDirectory = Input
+        for Depth in range(max(2, int(200 * Scale))):
+            CurrentDirectory = os.path.join(CurrentDirectory, f"d{Depth}")
+            os.makedirs(CurrentDirectory)
+            WriteRandomFile(os.path.join(CurrentDirectory, "file.bin"), 65536, RandomGenerator)
+
+    def PopulateMixed(Input):
+        for Index in range(int(200 * Scale)):
+            WriteRandomFile(os.path.join(Input, f"{Index:04}.bin"), RandomGenerator.randint(4096, 1048576), RandomGenerator)
+        WriteRandomFile(os.path.join(Input, "large.bin"), int(134217728 * Scale), RandomGenerator)
+
+    def DifferEarly(Input):
+        FlipByte(os.path.join(Input, "0000.bin"), 0)
+
+    def DifferLate(Input):
+        LargeFile = os.path.join(Input, "large.bin")
+        FlipByte(LargeFile, os.path.getsize(LargeFile) - 1)
+
+    CreateScenario("TinyFiles", PopulateTinyFiles)
+    CreateScenario("HugeFiles", PopulateHugeFiles)
+    CreateScenario("DeepNesting", PopulateDeepNesting)
+    CreateScenario("IdenticalTrees", PopulateMixed)
+    CreateScenario("EarlyDifference", PopulateMixed, DifferEarly)
+    CreateScenario("LateDifference", PopulateMixed, DifferLate)
+
+    return Scenarios
+
+
+# Case Running
+def RunCase(Case):
+    from Core.CompareInputs import CompareInputs
+    from Core.HashSettings import HashSettings
+    from Core.PageCache import GetPageCacheSize
+    from Core.ScanInput import ScanInput
+
+    Scans = [ScanInput(Case["InputOne"]), ScanInput(Case["InputTwo"])]
+    Settings = HashSettings(Workers=Case["Workers"], ChunkSize=Case["ChunkSize"], UseMemoryMap=Case["UseMemoryMap"], ReadMode=Case["ReadMode"], DeviceScheduling=Case["DeviceScheduling"], CollectMetrics=True)
+    StartPageCacheSize = GetPageCacheSize()
+
+    StartTime = time.perf_counter()
+    StartCPUTime = time.process_time()
+    Result = CompareInputs(Case["InputOne"], Case["InputTwo"], Method=Case["Method"], Algorithm=Case["Algorithm"], IgnoreSingleFileNames=False, Settings=Settings)
+    ElapsedTime = time.perf_counter() - StartTime
+    ElapsedCPUTime = time.process_time() - StartCPUTime
+    EndPageCacheSize = GetPageCacheSize()
+    PageCacheGrowth = EndPageCacheSize - StartPageCacheSize if StartPageCacheSize is not None and EndPageCacheSize is not None else None
+
+    # Throughput counts the bytes and files actually read, so cases that stop early or are settled by the prefilter are not credited with the whole inputs
+    MetricsDict = Settings.MetricsInst.ToDict()
+    return {"Identical": Result["Identical"] if isinstance(Result, dict) else Result, "Seconds": ElapsedTime, "CPUSeconds": ElapsedCPUTime, "Bytes": MetricsDict["Bytes"], "Files": MetricsDict["Files"], "InputBytes": sum(Scan.TotalSize for Scan in Scans), "InputFiles": sum(len(Scan.Files) for Scan in Scans), "PeakRSSBytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if platform.system() == "Darwin" else 1024), "PageCacheGrowthBytes": PageCacheGrowth, "Stages": MetricsDict["Stages"]}
+
+
+def RunCaseInSubprocess(Case):
+    # Each case runs in a fresh interpreter so peak RSS belongs to that case alone
+    CaseProcess = subprocess.run([sys.executable, os.path.abspath(__file__), "--run-case", json.dumps(Case)], capture_output=True, text=True)
+    if CaseProcess.returncode != 0:
+        print(CaseProcess.stderr, file=sys.stderr)
+        return None
+    return json.loads(CaseProcess.stdout.splitlines()[-1])
+
+
+def GetCaseKey(Case):
+    ChunkSize = Case["ChunkSize"] or "auto"
+    MemoryMap = "on" if Case["UseMemoryMap"] else "off"
+    return "/".join([Case["Scenario"], Case["Method"], str(Case["Algorithm"]), f"chunk={ChunkSize}", f"workers={Case['Workers']}", f"mmap={MemoryMap}", f"read={Case['ReadMode'].lower()}", f"devices={Case['DeviceScheduling'].lower()}"])
+
+
+def DropPageCache(Case):
+    try:
+        os.sync()
+        with open("/proc/sys/vm/drop_caches", "w") as DropCachesFile:
+            DropCachesFile.write("3\n")
+        return True
+    except OSError:
+        pass
+
+    # Without root, evict just the case's inputs, which the kernel allows for any readable file
+    if not hasattr(os, "posix_fadvise"):
+        return False
+    for Input in (Case["InputOne"], Case["InputTwo"]):
+        for DirectoryPath, DirectoryNames, FileNames in os.walk(Input):
+            for FileName in FileNames:
+                FileDescriptor = os.open(os.path.join(DirectoryPath, FileName), os.O_RDONLY)
+                try:
+                    os.posix_fadvise(FileDescriptor, 0, 0, os.POSIX_FADV_DONTNEED)
+                finally:
+                    os.close(FileDescriptor)
+    return True
+
+
+# Reporting
+def CompareResults(Results, BaselinePath):
+    with open(BaselinePath, "r") as BaselineFile:
+        BaselineResults = {Result["Key"]: Result for Result in json.loads(BaselineFile.read())["Results"]}
+    print(f"\n{'Case':<125} {'Baseline MB/s':>14} {'MB/s':>10} {'Change':>8}")
+    for Result in Results:
+        BaselineResult = BaselineResults.get(Result["Key"])
+        if BaselineResult is None or BaselineResult["MBPerSecond"] == 0:
+            continue
+        Change = (Result["MBPerSecond"] / BaselineResult["MBPerSecond"] - 1) * 100
+        print(f"{Result['Key']:<125} {BaselineResult['MBPerSecond']:>14.1f} {Result['MBPerSecond']:>10.1f} {Change:>+7.1f}%")
+
+
+def RunBenchmarks():
+    Parser = argparse.ArgumentParser(description="Benchmark the hashing and comparison core on synthetic trees.")
+    Parser.add_argument("--work-directory", help="where synthetic trees are generated and kept for later runs (default: a temporary directory, deleted afterwards)")
+    Parser.add_argument("--scale", type=float, default=1.0, help="multiplier for scenario sizes and file counts (default: %(default)s)")
+    Parser.add_argument("--scenarios", nargs="+", help="only run these scenarios")
+    Parser.add_argument("--algorithms", nargs="+", default=["md5", "sha1", "blake2b"])
+    Parser.add_argument("--chunk-sizes", nargs="+", type=int, default=[0, 65536, 1048576], help="0 is the adaptive chunk size")
+    Parser.add_argument("--workers", nargs="+", type=int, default=[1, 4])
+    Parser.add_argument("--memory-map", nargs="+", choices=["on", "off"], default=["on", "off"])
+    Parser.add_argument("--read-modes", nargs="+", choices=["buffered", "streaming", "direct"], default=["buffered"])
+    Parser.add_argument("--device-scheduling", nargs="+", choices=["auto", "interleaved", "parallel"], default=["auto"], help="interleaved takes turns between inputs on the same device; compare against parallel on a spinning disk (default: %(default)s)")
+    Parser.add_argument("--repeats", type=int, default=3, help="runs per case; the fastest is reported (default: %(default)s)")
+    Parser.add_argument("--drop-caches", action="store_true", help="drop the page cache before every run (Linux; without root, only the inputs are evicted)")
+    Parser.add_argument("--output", help="write results as JSON to this file")
+    Parser.add_argument("--compare", metavar="BASELINE", help="compare throughput against a previous JSON output")
+    Parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    Arguments = Parser.parse_args()
+
+    # Run a Single Case (Subprocess Mode)
+    if Arguments.run_case is not None:
+        print(json.dumps(RunCase(json.loads(Arguments.run_case))))
+        return
+
+    # Generate Scenarios
+    WorkDirectory = Arguments.work_directory if Arguments.work_directory is not None else tempfile.mkdtemp(prefix="ComparatorBenchmarks")
+    ScenarioDirectory = os.path.join(WorkDirectory, f"Scale{Arguments.scale}")
+    print(f"Generating scenarios in {ScenarioDirectory}...")
+    Scenarios = CreateScenarios(ScenarioDirectory, Arguments.scale)
+
+    # Build Cases
+    Cases = []
+    for ScenarioName, Scenario in Scenarios.items():
+        if Arguments.scenarios is not None and ScenarioName not in Arguments.scenarios:
+            continue
+        for Algorithm, ChunkSize, Workers, MemoryMap, ReadMode, DeviceScheduling in itertools.product(Arguments.algorithms, Arguments.chunk_sizes, Arguments.workers, Arguments.memory_map, Arguments.read_modes, Arguments.device_scheduling):
+            Cases.append({"Scenario": ScenarioName, "InputOne": Scenario["InputOne"], "InputTwo": Scenario["InputTwo"], "Method": "Hash", "Algorithm": Algorithm, "ChunkSize": ChunkSize or None, "Workers": Workers, "UseMemoryMap": MemoryMap == "on", "ReadMode": ReadMode.capitalize(), "DeviceScheduling": DeviceScheduling.capitalize()})
+        if not Scenario["Identical"]:
+            for ReadMode, DeviceScheduling in itertools.product(Arguments.read_modes, Arguments.device_scheduling):
+                Cases.append({"Scenario": ScenarioName, "InputOne": Scenario["InputOne"], "InputTwo": Scenario["InputTwo"], "Method": "Byte-for-Byte", "Algorithm": None, "ChunkSize": None, "Workers": 1, "UseMemoryMap": False, "ReadMode": ReadMode.capitalize(), "DeviceScheduling": DeviceScheduling.capitalize()})
+
+    # Run Cases
+    Results = []
+    DroppedCaches = False
+    print(f"\n{'Case':<125} {'Seconds':>9} {'MB/s':>10} {'Files/s':>10} {'Peak RSS MB':>12} {'Cache +MB':>10}")
+    for Case in Cases:
+        Runs = []
+        for Repeat in range(Arguments.repeats):
+            if Arguments.drop_caches:
+                DroppedCaches = DropPageCache(Case)
+            Run = RunCaseInSubprocess(Case)
+            if Run is not None:
+                Runs.append(Run)
+        if not Runs:
+            continue
+        FastestRun = min(Runs, key=lambda Run: Run["Seconds"])
+        Result = {"Key": GetCaseKey(Case), **{Key: Value for Key, Value in Case.items() if Key not in ("InputOne", "InputTwo")}, **FastestRun}
+        Result["MBPerSecond"] = Result["Bytes"] / 1000000 / Result["Seconds"] if Result["Seconds"] > 0 else 0
+        Result["FilesPerSecond"] = Result["Files"] / Result["Seconds"] if Result["Seconds"] > 0 else 0
+        Result["PeakRSSBytes"] = max(Run["PeakRSSBytes"] for Run in Runs)
+        Results.append(Result)
+        PageCacheGrowth = "n/a" if Result["PageCacheGrowthBytes"] is None else f"{Result['PageCacheGrowthBytes'] / 1000000:.1f}"
+        print(f"{Result['Key']:<125} {Result['Seconds']:>9.3f} {Result['MBPerSecond']:>10.1f} {Result['FilesPerSecond']:>10.0f} {Result['PeakRSSBytes'] / 1000000:>12.1f} {PageCacheGrowth:>10}")
+
+    # Output Results
+    Output = {"Machine": {"System": platform.system(), "Release": platform.release(), "Machine": platform.machine(), "Processor": platform.processor(), "CPUCount": os.cpu_count(), "Python": platform.python_version()}, "Time": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "Scale": Arguments.scale, "Repeats": Arguments.repeats, "ColdCache": DroppedCaches, "Results": Results}
+    if Arguments.output is not None:
+        with open(Arguments.output, "w") as OutputFile:
+            OutputFile.write(json.dumps(Output, indent=2))
+        print(f"\nResults written to {Arguments.output}.")
+    if Arguments.compare is not None:
+        CompareResults(Results, Arguments.compare)
+
+    # Clean Up
+    if Arguments.work_directory is None:
+        shutil.rmtree(WorkDirectory)
+
+
+if __name__ == "__main__":
+    RunBenchmarks()
@@ -0,0 +1,134 @@
+import os
+import posixpath
+import stat
+
+from Core.CancellationToken import CheckCancellation
+from Core.Metrics import MeasureStage
+from Core.ScanInput import InputScan, ScannedFile
+
+# Compressed Tar Signatures (gzip, bzip2, and xz streams can only be decompressed front to back, so listing such an archive already reads all of it)
+CompressedTarSignatures = (b"\x1f\x8b", b"BZh", b"\xfd7zXZ\x00")
+
+
+class ArchiveMemberStat:
+    # Stands in for os.stat_result, so members pass through size checks, progress, and metrics like files on disk
+    __slots__ = ("st_size", "st_mode")
+
+    def __init__(self, Size):
+        self.st_size = Size
+        self.st_mode = stat.S_IFREG | 0o444
+
+
+def GetArchiveErrors():
+    # Errors raised by damaged or unsupported archives (encrypted zip members raise RuntimeError, unsupported compression NotImplementedError); tarfile and zipfile are imported only when archives are used, keeping them out of the command line's startup
+    import tarfile
+    import zipfile
+    import zlib
+    return (tarfile.TarError, zipfile.BadZipFile, zlib.error, EOFError, RuntimeError, NotImplementedError)
+
+
+def GetArchiveType(Path):
+    import tarfile
+    import zipfile
+    if not os.path.isfile(Path):
+        return None
+    if zipfile.is_zipfile(Path):
+        return "Zip"
+    if tarfile.is_tarfile(Path):
+        return "Tar"
+    return None
+
+
+def IsArchiveFile(Path):
+    return GetArchiveType(Path) is not None
+
+
+def IsCompressedTar(Path):
+    with open(Path, "rb") as ArchiveFile:
+        return ArchiveFile.read(6).startswith(CompressedTarSignatures)
+
+
+def NormalizeMemberName(Name):
+    # Leading slashes and ./ are dropped as when extracting; members that would land outside the directory are skipped
+    Name = posixpath.normpath(Name.lstrip("/"))
+    if Name in (".", "..") or Name.startswith("../"):
+        return None
+    return Name
+
+
+def ReadArchiveMembers(Archive, ArchiveType, CancellationTokenInst=None, HashMember=None):
+    # Returns the regular files of an archive as {member path: (name the reader opens it by, size)}, and their digests when they were hashed while listing; a later member of the same path replaces an earlier one, as when extracting
+    import tarfile
+    import zipfile
+    Members = {}
+    MemberDigests = None
+    try:
+        if ArchiveType == "Zip":
+            # The central directory lists every member without reading their data
+            with zipfile.ZipFile(Archive) as ZipFileInst:
+                for Info in ZipFileInst.infolist():
+                    MemberPath = NormalizeMemberName(Info.filename)
+                    if MemberPath is not None and not Info.is_dir() and not stat.S_ISLNK(Info.external_attr >> 16):
+                        Members[MemberPath] = (Info.filename, Info.file_size)
+        else:
+            # Uncompressed tar archives are listed by seeking from header to header; compressed ones have to be decompressed to find their headers, so their members are hashed in that same pass instead of decompressing them again later
+            if HashMember is not None and IsCompressedTar(Archive):
+                MemberDigests = {}
+            with tarfile.open(Archive, "r:*") as TarFileInst:
+                for Info in TarFileInst:
+                    CheckCancellation(CancellationTokenInst)
+                    MemberPath = NormalizeMemberName(Info.name)
+                    if MemberPath is None:
+                        continue
+                    if Info.isreg():
+                        Members[MemberPath] = (MemberPath, Info.size)
+                        if MemberDigests is not None:
+                            MemberDigests[MemberPath] = HashMember(Archive, MemberPath, TarFileInst.extractfile(Info), Info.size)
+                    elif Info.islnk() and NormalizeMemberName(Info.linkname) in Members:
+                        # Hard links share the digest of the member they link to
+                        Members[MemberPath] = Members[NormalizeMemberName(Info.linkname)]
+    except GetArchiveErrors() as Error:
+        raise OSError(f"{Archive} could not be read as an archive:  {Error}") from Error
+    return Members, MemberDigests
+
+
+def ScanArchive(Archive, Directory, CancellationTokenInst=None, MetricsInst=None, HashMember=None):
+    # Scans a zip or tar archive as the tree it would extract to in the directory, so its members line up with ScanInput's files of that directory; HashMember(archive, member path, member file, size) hashes the members of compressed tar archives during the scan
+    with MeasureStage(MetricsInst, "Scan"):
+        ArchiveType = GetArchiveType(Archive)
+        Members, MemberDigests = ReadArchiveMembers(Archive, ArchiveType, CancellationTokenInst=CancellationTokenInst, HashMember=HashMember)
+
+        # An archive holding a single top-level directory is compared as that directory, unless the directory itself holds one of the same name
+        MemberPrefix = ""
+        TopLevelNames = {MemberPath.split("/", 1)[0] for MemberPath in Members}
+        if len(TopLevelNames) == 1 and all("/" in MemberPath for MemberPath in Members):
+            TopLevelName = next(iter(TopLevelNames))
+            if not os.path.isdir(os.path.join(Directory, TopLevelName)):
+                MemberPrefix = f"{TopLevelName}/"
+
+        # Map Members onto the Directory
+        RelativeDirectoryPath = os.path.basename(Directory)
+        Files = []
+        for MemberPath, (MemberName, MemberSize) in Members.items():
+            ManifestPath = MemberPath[len(MemberPrefix):]
+            Files.append(ScannedFile(os.path.join(RelativeDirectoryPath, *ManifestPath.split("/")), ManifestPath, os.path.join(Archive, MemberPath), ArchiveMemberStat(MemberSize), Member=MemberName))
+        Files.sort(key=lambda File: File.RelativePath)
+
+        return InputScan(Archive, os.path.dirname(Archive), Files, ArchiveType=ArchiveType, MemberDigests=MemberDigests)
+
+
+def IterateArchiveMembers(Archive, ArchiveType, MemberNames):
+    # Yields (member name, readable member) for the named members in the order they are stored, in one forward pass over the archive; compressed tar archives cannot seek back
+    import tarfile
+    import zipfile
+    if ArchiveType == "Zip":
+        with zipfile.ZipFile(Archive) as ZipFileInst:
+            for MemberName in sorted(MemberNames, key=lambda MemberName: ZipFileInst.getinfo(MemberName).header_offset):
+                with ZipFileInst.open(MemberName) as MemberFile:
+                    yield MemberName, MemberFile
+    else:
+        with tarfile.open(Archive, "r|*") as TarFileInst:
+            for Info in TarFileInst:
+                MemberPath = NormalizeMemberName(Info.name)
+                if MemberPath in MemberNames and Info.isreg():
+                    yield MemberPath, TarFileInst.extractfile(Info)
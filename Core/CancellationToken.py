@@ -0,0 +1,43 @@
+import threading
+
+
+class ComparisonCancelled(Exception):
+    pass
+
+
+class CancellationToken:
+    def __init__(self):
+        # Variables
+        self.CancelledEvent = threading.Event()
+        self.ResumedEvent = threading.Event()
+        self.ResumedEvent.set()
+
+    @property
+    def Cancelled(self):
+        return self.CancelledEvent.is_set()
+
+    @property
+    def Paused(self):
+        return not self.ResumedEvent.is_set()
+
+    def Cancel(self):
+        # Cancelling also wakes paused readers so they can stop
+        self.CancelledEvent.set()
+        self.ResumedEvent.set()
+
+    def Pause(self):
+        self.ResumedEvent.clear()
+
+    def Resume(self):
+        self.ResumedEvent.set()
+
+    def Check(self):
+        # Readers call this between chunks and files; it blocks while paused and raises once cancelled
+        self.ResumedEvent.wait()
+        if self.CancelledEvent.is_set():
+            raise ComparisonCancelled()
+
+
+def CheckCancellation(CancellationTokenInst):
+    if CancellationTokenInst is not None:
+        CancellationTokenInst.Check()
@@ -0,0 +1,88 @@
+from Core.CancellationToken import CheckCancellation
+from Core.DeviceSchedule import CreateDeviceSchedules
+from Core.HashSettings import HashSettings
+from Core.PageCache import AdviseSequentialRead, ReleaseReadRange
+from Core.ProgressReporter import CreateProgressReporter
+from Core.RateLimiter import LimitRate
+from Core.ScanInput import ScanInput
+from Core.ValidateInputs import ValidateInputs
+
+
+def CompareInputFilesDirectly(InputOne, InputTwo, IgnoreSingleFileNames=True, Settings=None):
+    # Validate Inputs
+    if not ValidateInputs(InputOne, InputTwo, IgnoreSingleFileNames):
+        return None
+
+    def Result(Identical, File=None, Offset=None):
+        return {"Identical": Identical, "File": File, "Offset": Offset}
+
+    # Scan Inputs
+    Settings = Settings if Settings is not None else HashSettings()
+    InputOneScan = ScanInput(InputOne, CancellationTokenInst=Settings.CancellationTokenInst, MetricsInst=Settings.MetricsInst)
+    InputTwoScan = ScanInput(InputTwo, CancellationTokenInst=Settings.CancellationTokenInst, MetricsInst=Settings.MetricsInst)
+    FilePathsOne = InputOneScan.FilePaths
+    FilePathsTwo = InputTwoScan.FilePaths
+
+    # Check File Paths in Lockstep
+    if not IgnoreSingleFileNames:
+        for RelativeFileOne, RelativeFileTwo in zip(FilePathsOne, FilePathsTwo):
+            if RelativeFileOne != RelativeFileTwo:
+                return Result(False, File=min(RelativeFileOne, RelativeFileTwo))
+    if len(FilePathsOne) != len(FilePathsTwo):
+        ShorterFilePaths, LongerFilePaths = sorted((FilePathsOne, FilePathsTwo), key=len)
+        return Result(False, File=LongerFilePaths[len(ShorterFilePaths)])
+
+    # Check File Sizes Before Reading (a size difference is reported without reading either file, and without an offset, since the contents may differ earlier)
+    for FileOne, FileTwo in zip(InputOneScan.Files, InputTwoScan.Files):
+        if FileOne.Stat.st_size != FileTwo.Stat.st_size:
+            return Result(False, File=FileOne.RelativePath)
+
+    # Create Progress Reporter
+    ChunkSize = Settings.ChunkSize if Settings.ChunkSize is not None else Settings.MinimumChunkSize
+    if CreateDeviceSchedules([InputOneScan, InputTwoScan], Settings)[0] is not None:
+        # Inputs sharing a seeking device are read in long extents, so the disk does not seek between them on every chunk
+        ChunkSize = max(ChunkSize, Settings.InterleaveExtentSize)
+    ProgressReporterInst = CreateProgressReporter(Settings, [InputOneScan, InputTwoScan])
+
+    def ReportProgress(Report, *Arguments):
+        if ProgressReporterInst is not None:
+            for InputIndex, Argument in enumerate(Arguments):
+                getattr(ProgressReporterInst, Report)(InputIndex, Argument)
+
+    # Compare File Contents in Lockstep
+    for FileOne, FileTwo in zip(InputOneScan.Files, InputTwoScan.Files):
+        Offset = 0
+        ReportProgress("FileStarted", FileOne, FileTwo)
+        LimitRate(Settings.RateLimiterInst, FileCount=2, CancellationTokenInst=Settings.CancellationTokenInst)
+        with open(FileOne.Path, "rb") as OpenedFileOne, open(FileTwo.Path, "rb") as OpenedFileTwo:
+            AdviseSequentialRead(Settings.ReadMode, OpenedFileOne.fileno())
+            AdviseSequentialRead(Settings.ReadMode, OpenedFileTwo.fileno())
+            while True:
+                CheckCancellation(Settings.CancellationTokenInst)
+                ChunkOne = OpenedFileOne.read(ChunkSize)
+                ChunkTwo = OpenedFileTwo.read(ChunkSize)
+                if Settings.MetricsInst is not None:
+                    Settings.MetricsInst.AddCount("Bytes", len(ChunkOne) + len(ChunkTwo))
+                if ChunkOne != ChunkTwo:
+                    # Narrow down to the first differing slice before scanning its bytes, since extent-sized chunks are large; chunks that only differ in length (a file changed while it was compared) differ where the shorter one ends
+                    SliceSize = Settings.MinimumChunkSize
+                    CommonLength = min(len(ChunkOne), len(ChunkTwo))
+                    SliceStart = next((Start for Start in range(0, CommonLength, SliceSize) if ChunkOne[Start:Start + SliceSize] != ChunkTwo[Start:Start + SliceSize]), CommonLength)
+                    MismatchIndex = next((SliceStart + Index for Index, (ByteOne, ByteTwo) in enumerate(zip(ChunkOne[SliceStart:SliceStart + SliceSize], ChunkTwo[SliceStart:SliceStart + SliceSize])) if ByteOne != ByteTwo), CommonLength)
+                    return Result(False, File=FileOne.RelativePath, Offset=Offset + MismatchIndex)
+                if not ChunkOne:
+                    break
+                ReleaseReadRange(Settings.ReadMode, OpenedFileOne.fileno(), Offset, len(ChunkOne))
+                ReleaseReadRange(Settings.ReadMode, OpenedFileTwo.fileno(), Offset, len(ChunkTwo))
+                Offset += len(ChunkOne)
+                LimitRate(Settings.RateLimiterInst, ByteCount=len(ChunkOne) + len(ChunkTwo), CancellationTokenInst=Settings.CancellationTokenInst)
+                ReportProgress("BytesHashed", len(ChunkOne), len(ChunkTwo))
+        ReportProgress("FileDone", None, None)
+        if Settings.MetricsInst is not None:
+            Settings.MetricsInst.AddCount("Files", 2)
+
+    # Finish Progress
+    if ProgressReporterInst is not None:
+        ProgressReporterInst.Finish()
+
+    return Result(True)
@@ -0,0 +1,63 @@
+import os
+import queue
+
+from Core.CancellationToken import CheckCancellation
+from Core.CompareManifests import CompareManifests
+from Core.DetermineAlgorithm import DetermineAlgorithm
+from Core.DeviceSchedule import CreateDeviceSchedules
+from Core.DigestCache import DigestCache
+from Core.HashSettings import HashSettings
+from Core.HashThread import HashThread, RaiseHashThreadErrors
+from Core.ProgressReporter import CreateProgressReporter
+from Core.ScanInput import ScanInput
+from Core.ValidateInputs import ValidateInputs
+
+
+def CompareInputManifests(InputOne, InputTwo, Algorithm=None, IgnoreSingleFileNames=True, Settings=None):
+    # Validate Inputs
+    if not ValidateInputs(InputOne, InputTwo, IgnoreSingleFileNames):
+        return None
+
+    # Determine Algorithm
+    Algorithm = DetermineAlgorithm(Algorithm)
+    if Algorithm is None:
+        return None
+
+    # Scan Inputs
+    Settings = Settings if Settings is not None else HashSettings()
+    InputOneScan = ScanInput(InputOne, CancellationTokenInst=Settings.CancellationTokenInst, MetricsInst=Settings.MetricsInst)
+    InputTwoScan = ScanInput(InputTwo, CancellationTokenInst=Settings.CancellationTokenInst, MetricsInst=Settings.MetricsInst)
+
+    # Open Digest Cache
+    DigestCacheInst = DigestCache(Settings.DigestCachePath, MaxEntries=Settings.DigestCacheMaxEntries) if Settings.DigestCachePath is not None else None
+
+    # Create Progress Reporter
+    ProgressReporterInst = CreateProgressReporter(Settings, [InputOneScan, InputTwoScan])
+
+    # Build Manifests in Threads
+    DeviceSchedules = CreateDeviceSchedules([InputOneScan, InputTwoScan], Settings)
+    ResultQueue = queue.Queue()
+    InputOneThread = HashThread("HashThreadOne", InputOneScan, ResultQueue, Algorithm, IgnoreSingleFileNames=IgnoreSingleFileNames, Settings=Settings, DigestCacheInst=DigestCacheInst, ProgressReporterInst=ProgressReporterInst, InputIndex=0, DeviceScheduleInst=DeviceSchedules[0])
+    InputOneThread.start()
+    InputTwoThread = HashThread("HashThreadTwo", InputTwoScan, ResultQueue, Algorithm, IgnoreSingleFileNames=IgnoreSingleFileNames, Settings=Settings, DigestCacheInst=DigestCacheInst, ProgressReporterInst=ProgressReporterInst, InputIndex=1, DeviceScheduleInst=DeviceSchedules[1])
+    InputTwoThread.start()
+    InputOneThread.join()
+    InputTwoThread.join()
+    ManifestOne = InputOneThread.Manifest
+    ManifestTwo = InputTwoThread.Manifest
+
+    # Close Digest Cache, Keeping Digests Stored Before Any Cancellation
+    if DigestCacheInst is not None:
+        DigestCacheInst.Close()
+    CheckCancellation(Settings.CancellationTokenInst)
+    RaiseHashThreadErrors([InputOneThread, InputTwoThread])
+
+    # Finish Progress
+    if ProgressReporterInst is not None:
+        ProgressReporterInst.Finish()
+
+    # Match Single File Names When Ignoring File Names
+    if IgnoreSingleFileNames:
+        ManifestTwo = {os.path.basename(InputOne): FileEntry for FileEntry in ManifestTwo.values()}
+
+    return CompareManifests(ManifestOne, ManifestTwo)
@@ -0,0 +1,23 @@
+from Core.CompareInputFilesDirectly import CompareInputFilesDirectly
+from Core.CompareInputManifests import CompareInputManifests
+from Core.CompareInputsByContent import CompareInputsByContent
+from Core.CompareInputsByMerkleTree import CompareInputsByMerkleTree
+from Core.HashAndCompareInputFiles import HashAndCompareInputFiles
+
+ComparisonMethods = ["Hash", "Byte-for-Byte", "Per-File Manifest", "Merkle Tree", "Rename-Aware"]
+
+
+def CompareInputs(InputOne, InputTwo, Method="Hash", Algorithm=None, IgnoreSingleFileNames=True, Settings=None):
+    if Method == "Hash":
+        return HashAndCompareInputFiles(InputOne, InputTwo, Algorithm=Algorithm, IgnoreSingleFileNames=IgnoreSingleFileNames, Settings=Settings, ReturnDetails=True)
+    elif Method == "Byte-for-Byte":
+        return CompareInputFilesDirectly(InputOne, InputTwo, IgnoreSingleFileNames=IgnoreSingleFileNames, Settings=Settings)
+    elif Method == "Per-File Manifest":
+        return CompareInputManifests(InputOne, InputTwo, Algorithm=Algorithm, IgnoreSingleFileNames=IgnoreSingleFileNames, Settings=Settings)
+    elif Method == "Merkle Tree":
+        return CompareInputsByMerkleTree(InputOne, InputTwo, Algorithm=Algorithm, IgnoreSingleFileNames=IgnoreSingleFileNames, Settings=Settings)
+    elif Method == "Rename-Aware":
+        return CompareInputsByContent(InputOne, InputTwo, Algorithm=Algorithm, IgnoreSingleFileNames=IgnoreSingleFileNames, Settings=Settings)
+    else:
+        print(f"Comparison method not available.  Available methods:\n\n{str(ComparisonMethods)}")
+        return None
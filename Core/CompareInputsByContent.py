@@ -0,0 +1,106 @@
+import os
+import queue
+
+from Core.CancellationToken import CheckCancellation
+from Core.DetermineAlgorithm import DetermineAlgorithm
+from Core.DeviceSchedule import CreateDeviceSchedules
+from Core.DigestCache import DigestCache
+from Core.HashSettings import HashSettings
+from Core.HashThread import HashThread, RaiseHashThreadErrors
+from Core.ProgressReporter import CreateProgressReporter
+from Core.ScanInput import InputScan, ScanInput
+from Core.ValidateInputs import ValidateInputs
+
+
+def CompareInputsByContent(InputOne, InputTwo, Algorithm=None, IgnoreSingleFileNames=True, Settings=None):
+    # Validate Inputs
+    if not ValidateInputs(InputOne, InputTwo, IgnoreSingleFileNames):
+        return None
+
+    # Determine Algorithm
+    Algorithm = DetermineAlgorithm(Algorithm)
+    if Algorithm is None:
+        return None
+
+    # Scan Inputs
+    Settings = Settings if Settings is not None else HashSettings()
+    InputOneScan = ScanInput(InputOne, CancellationTokenInst=Settings.CancellationTokenInst, MetricsInst=Settings.MetricsInst)
+    InputTwoScan = ScanInput(InputTwo, CancellationTokenInst=Settings.CancellationTokenInst, MetricsInst=Settings.MetricsInst)
+
+    # Key Files by Path (single files are matched to each other when ignoring file names)
+    InputOneFiles = {File.ManifestPath: File for File in InputOneScan.Files}
+    InputTwoFiles = {File.ManifestPath: File for File in InputTwoScan.Files}
+    if IgnoreSingleFileNames and os.path.isfile(InputOne):
+        InputTwoFiles = {ManifestPath: File for ManifestPath, File in zip(InputOneFiles.keys(), InputTwoFiles.values())}
+
+    # Only files whose size occurs in the other input can match anything there by content, so only those are read
+    InputOneSizes = {File.Stat.st_size for File in InputOneFiles.values()}
+    InputTwoSizes = {File.Stat.st_size for File in InputTwoFiles.values()}
+    InputOneHashedScan = InputScan(InputOne, InputOneScan.InputDirectory, [File for File in InputOneFiles.values() if File.Stat.st_size in InputTwoSizes])
+    InputTwoHashedScan = InputScan(InputTwo, InputTwoScan.InputDirectory, [File for File in InputTwoFiles.values() if File.Stat.st_size in InputOneSizes])
+
+    # Open Digest Cache
+    DigestCacheInst = DigestCache(Settings.DigestCachePath, MaxEntries=Settings.DigestCacheMaxEntries) if Settings.DigestCachePath is not None else None
+
+    # Create Progress Reporter
+    ProgressReporterInst = CreateProgressReporter(Settings, [InputOneHashedScan, InputTwoHashedScan])
+
+    # Hash Each Candidate File Once, in Threads
+    DeviceSchedules = CreateDeviceSchedules([InputOneScan, InputTwoScan], Settings)
+    ResultQueue = queue.Queue()
+    InputOneThread = HashThread("HashThreadOne", InputOneHashedScan, ResultQueue, Algorithm, Settings=Settings, DigestCacheInst=DigestCacheInst, ProgressReporterInst=ProgressReporterInst, InputIndex=0, DeviceScheduleInst=DeviceSchedules[0])
+    InputOneThread.start()
+    InputTwoThread = HashThread("HashThreadTwo", InputTwoHashedScan, ResultQueue, Algorithm, Settings=Settings, DigestCacheInst=DigestCacheInst, ProgressReporterInst=ProgressReporterInst, InputIndex=1, DeviceScheduleInst=DeviceSchedules[1])
+    InputTwoThread.start()
+    InputOneThread.join()
+    InputTwoThread.join()
+
+    # Close Digest Cache, Keeping Digests Stored Before Any Cancellation
+    if DigestCacheInst is not None:
+        DigestCacheInst.Close()
+    CheckCancellation(Settings.CancellationTokenInst)
+    RaiseHashThreadErrors([InputOneThread, InputTwoThread])
+
+    # Finish Progress
+    if ProgressReporterInst is not None:
+        ProgressReporterInst.Finish()
+
+    # Content Keys (files that were not read have a size no file in the other input shares, so the size alone keeps them apart)
+    def GetContentKey(File, Manifest):
+        FileEntry = Manifest.get(File.ManifestPath)
+        return (File.Stat.st_size, None if FileEntry is None else FileEntry["Digest"])
+
+    InputOneKeys = {ManifestPath: GetContentKey(File, InputOneThread.Manifest) for ManifestPath, File in InputOneFiles.items()}
+    InputTwoKeys = {ManifestPath: GetContentKey(File, InputTwoThread.Manifest) for ManifestPath, File in InputTwoFiles.items()}
+
+    # Stage One:  Files Unchanged at the Same Path
+    UnmatchedOne = {ManifestPath for ManifestPath in InputOneKeys if InputTwoKeys.get(ManifestPath) != InputOneKeys[ManifestPath]}
+    UnmatchedTwo = {ManifestPath for ManifestPath in InputTwoKeys if InputOneKeys.get(ManifestPath) != InputTwoKeys[ManifestPath]}
+
+    # Stage Two:  Unmatched Files Paired by Content, Preferring Candidates That Keep Their Name
+    CandidatesByContent = {}
+    for ManifestPath in sorted(UnmatchedTwo):
+        if InputTwoKeys[ManifestPath][1] is not None:
+            CandidatesByContent.setdefault(InputTwoKeys[ManifestPath], []).append(ManifestPath)
+    Renamed = {}
+    Moved = {}
+    for ManifestPath in sorted(UnmatchedOne):
+        Candidates = CandidatesByContent.get(InputOneKeys[ManifestPath])
+        if not Candidates:
+            continue
+        NewManifestPath = min(Candidates, key=lambda Candidate: (Candidate.rsplit("/", 1)[-1] != ManifestPath.rsplit("/", 1)[-1], Candidate))
+        Candidates.remove(NewManifestPath)
+        UnmatchedOne.remove(ManifestPath)
+        UnmatchedTwo.remove(NewManifestPath)
+        if ManifestPath.rpartition("/")[0] == NewManifestPath.rpartition("/")[0]:
+            Renamed[ManifestPath] = NewManifestPath
+        else:
+            Moved[ManifestPath] = NewManifestPath
+
+    # Stage Three:  Remaining Files Are Changed in Place, Added, or Removed
+    Changed = sorted(ManifestPath for ManifestPath in UnmatchedOne if ManifestPath in UnmatchedTwo)
+    Added = sorted(ManifestPath for ManifestPath in UnmatchedTwo if ManifestPath not in UnmatchedOne)
+    Removed = sorted(ManifestPath for ManifestPath in UnmatchedOne if ManifestPath not in UnmatchedTwo)
+    ContentIdentical = not (Added or Removed or Changed)
+
+    return {"Identical": ContentIdentical and not (Renamed or Moved), "ContentIdentical": ContentIdentical, "Added": Added, "Removed": Removed, "Changed": Changed, "Renamed": Renamed, "Moved": Moved, "HashedFiles": len(InputOneHashedScan.Files) + len(InputTwoHashedScan.Files)}
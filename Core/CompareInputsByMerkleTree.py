@@ -0,0 +1,64 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from Core.DetermineAlgorithm import DetermineAlgorithm
+from Core.DeviceSchedule import CreateDeviceSchedules
+from Core.HashSettings import HashSettings
+from Core.MerkleTree import FindMismatchedRanges, GetMerkleTree
+from Core.ProgressReporter import CreateProgressReporter
+from Core.ScanInput import ScanInput
+from Core.ValidateInputs import ValidateInputs
+
+
+def CompareInputsByMerkleTree(InputOne, InputTwo, Algorithm=None, IgnoreSingleFileNames=True, Settings=None):
+    # Validate Inputs
+    if not ValidateInputs(InputOne, InputTwo, IgnoreSingleFileNames):
+        return None
+
+    # Determine Algorithm
+    Algorithm = DetermineAlgorithm(Algorithm)
+    if Algorithm is None:
+        return None
+
+    # Scan Inputs
+    Settings = Settings if Settings is not None else HashSettings()
+    InputOneScan = ScanInput(InputOne, CancellationTokenInst=Settings.CancellationTokenInst, MetricsInst=Settings.MetricsInst)
+    InputTwoScan = ScanInput(InputTwo, CancellationTokenInst=Settings.CancellationTokenInst, MetricsInst=Settings.MetricsInst)
+    ProgressReporterInst = CreateProgressReporter(Settings, [InputOneScan, InputTwoScan])
+
+    # Match Files by Path (single files are matched to each other when ignoring file names)
+    InputOneFiles = {File.ManifestPath: File for File in InputOneScan.Files}
+    InputTwoFiles = {File.ManifestPath: File for File in InputTwoScan.Files}
+    if IgnoreSingleFileNames and os.path.isfile(InputOne):
+        InputTwoFiles = {ManifestPath: File for ManifestPath, File in zip(InputOneFiles.keys(), InputTwoFiles.values())}
+    Added = sorted(ManifestPath for ManifestPath in InputTwoFiles if ManifestPath not in InputOneFiles)
+    Removed = sorted(ManifestPath for ManifestPath in InputOneFiles if ManifestPath not in InputTwoFiles)
+
+    def BuildTree(InputIndex, File):
+        if ProgressReporterInst is not None:
+            ProgressReporterInst.FileStarted(InputIndex, File)
+        ReportBytes = (lambda ByteCount: ProgressReporterInst.BytesHashed(InputIndex, ByteCount)) if ProgressReporterInst is not None else None
+        MerkleTree = GetMerkleTree(File.Path, Algorithm, Settings.MerkleBlockSize, Workers=Settings.Workers, ReportBytes=ReportBytes, TreeDirectory=Settings.MerkleTreeDirectory, CancellationTokenInst=Settings.CancellationTokenInst, RateLimiterInst=Settings.RateLimiterInst, ReadMode=Settings.ReadMode, MetricsInst=Settings.MetricsInst)
+        if ProgressReporterInst is not None:
+            ProgressReporterInst.FileDone(InputIndex, File)
+        return MerkleTree
+
+    # Build Trees for Both Inputs in Parallel and Localize Differences (inputs sharing a seeking device build one tree at a time, so each file is read sequentially)
+    Changed = {}
+    SharesDevice = CreateDeviceSchedules([InputOneScan, InputTwoScan], Settings)[0] is not None
+    with ThreadPoolExecutor(max_workers=1 if SharesDevice else 2, thread_name_prefix="MerkleTreeThread") as Executor:
+        for ManifestPath, InputOneFile in InputOneFiles.items():
+            if ManifestPath not in InputTwoFiles:
+                continue
+            InputTwoFile = InputTwoFiles[ManifestPath]
+            MerkleTreeOneFuture = Executor.submit(BuildTree, 0, InputOneFile)
+            MerkleTreeTwoFuture = Executor.submit(BuildTree, 1, InputTwoFile)
+            MismatchedRanges = FindMismatchedRanges(MerkleTreeOneFuture.result(), MerkleTreeTwoFuture.result())
+            if MismatchedRanges:
+                Changed[ManifestPath] = MismatchedRanges
+
+    # Finish Progress
+    if ProgressReporterInst is not None:
+        ProgressReporterInst.Finish()
+
+    return {"Identical": not (Added or Removed or Changed), "Added": Added, "Removed": Removed, "Changed": sorted(Changed.keys()), "MismatchedRanges": Changed}
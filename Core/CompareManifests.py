@@ -0,0 +1,5 @@
+def CompareManifests(ManifestOne, ManifestTwo):
+    Added = sorted(RelativePath for RelativePath in ManifestTwo if RelativePath not in ManifestOne)
+    Removed = sorted(RelativePath for RelativePath in ManifestOne if RelativePath not in ManifestTwo)
+    Changed = sorted(RelativePath for RelativePath in ManifestOne if RelativePath in ManifestTwo and ManifestOne[RelativePath] != ManifestTwo[RelativePath])
+    return {"Identical": not (Added or Removed or Changed), "Added": Added, "Removed": Removed, "Changed": Changed}
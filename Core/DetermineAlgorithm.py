@@ -0,0 +1,15 @@
+from Core.HashBackends import GetDefaultAlgorithm, GetSelectableAlgorithms, ResolveAlgorithm
+
+
+def DetermineAlgorithm(Algorithm=None):
+    AvailableAlgorithms = GetSelectableAlgorithms()
+    if Algorithm is None:
+        Algorithm = GetDefaultAlgorithm()
+        if Algorithm is None:
+            print(f"No default algorithm is present.  Available algorithms:\n\n{str(AvailableAlgorithms)}")
+            return None
+    ResolvedAlgorithm = ResolveAlgorithm(Algorithm)
+    if ResolvedAlgorithm is None:
+        print(f"Algorithm not available.  Available algorithms:\n\n{str(AvailableAlgorithms)}")
+        return None
+    return ResolvedAlgorithm
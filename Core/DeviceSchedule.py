@@ -0,0 +1,95 @@
+import collections
+import os
+import threading
+
+from Core.CancellationToken import CheckCancellation
+
+# Device Scheduling Modes (auto interleaves inputs that share a device unless the device is known not to seek, such as an SSD)
+DeviceSchedulingModes = ["Auto", "Interleaved", "Parallel"]
+
+
+class DeviceSchedule:
+    def __init__(self, ExtentSize):
+        # Variables
+        self.Condition = threading.Condition()
+        self.Owner = None
+        self.OwnerBytes = 0
+        self.WaitingInputs = collections.deque()
+
+        # Store Parameters
+        self.ExtentSize = ExtentSize
+
+    def Acquire(self, InputIndex, ByteCount, CancellationTokenInst=None):
+        # One input at a time reads a large sequential extent, then hands the device to the next waiting input in arrival order; every worker of the owning input may read
+        with self.Condition:
+            if self.Owner is None and not self.WaitingInputs:
+                self.Owner = InputIndex
+            if self.Owner != InputIndex and InputIndex not in self.WaitingInputs:
+                self.WaitingInputs.append(InputIndex)
+            while self.Owner != InputIndex:
+                self.Condition.wait(0.1)
+                if self.Owner != InputIndex:
+                    with ReleasedCondition(self.Condition):
+                        CheckCancellation(CancellationTokenInst)
+            self.OwnerBytes += ByteCount
+            if self.OwnerBytes >= self.ExtentSize and self.WaitingInputs:
+                self.HandOver()
+
+    def Release(self, InputIndex):
+        # Called once an input has nothing left to read
+        with self.Condition:
+            if InputIndex in self.WaitingInputs:
+                self.WaitingInputs.remove(InputIndex)
+            if self.Owner == InputIndex:
+                if self.WaitingInputs:
+                    self.HandOver()
+                else:
+                    self.Owner = None
+
+    def HandOver(self):
+        self.Owner = self.WaitingInputs.popleft()
+        self.OwnerBytes = 0
+        self.Condition.notify_all()
+
+
+class ReleasedCondition:
+    # Releases a held condition for the duration of a block, so a paused reader does not hold up the others
+    def __init__(self, Condition):
+        self.Condition = Condition
+
+    def __enter__(self):
+        self.Condition.release()
+
+    def __exit__(self, ExceptionType, ExceptionValue, Traceback):
+        self.Condition.acquire()
+
+
+def IsRotationalDevice(DeviceNumber):
+    # Linux reports whether a block device seeks in sysfs; partitions inherit the flag of their disk. Filesystems without a block device of their own (tmpfs, overlayfs, network filesystems, btrfs subvolumes, ZFS) have no flag and are not treated as seeking
+    DevicePath = f"/sys/dev/block/{os.major(DeviceNumber)}:{os.minor(DeviceNumber)}"
+    for RotationalPath in (os.path.join(DevicePath, "queue", "rotational"), os.path.join(DevicePath, "..", "queue", "rotational")):
+        try:
+            with open(RotationalPath, "r") as RotationalFile:
+                return RotationalFile.read().strip() == "1"
+        except OSError:
+            continue
+    return False
+
+
+def CreateDeviceSchedules(InputScans, Settings):
+    # Returns one schedule (or None) per input; inputs on the same device share a schedule
+    Schedules = [None] * len(InputScans)
+    if Settings.DeviceScheduling == "Parallel":
+        return Schedules
+    InputIndicesByDevice = {}
+    for InputIndex, InputScanInst in enumerate(InputScans):
+        InputIndicesByDevice.setdefault(os.stat(InputScanInst.Input).st_dev, []).append(InputIndex)
+    for DeviceNumber, InputIndices in InputIndicesByDevice.items():
+        if len(InputIndices) < 2:
+            continue
+        if Settings.DeviceScheduling == "Auto" and not IsRotationalDevice(DeviceNumber):
+            continue
+        SharedSchedule = DeviceSchedule(Settings.InterleaveExtentSize)
+        for InputIndex in InputIndices:
+            Schedules[InputIndex] = SharedSchedule
+    return Schedules
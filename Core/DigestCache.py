@@ -0,0 +1,64 @@
+import os
+import threading
+import time
+
+
+class DigestCache:
+    def __init__(self, CachePath, MaxEntries=1000000):
+        # Variables
+        self.Lock = threading.Lock()
+        self.UsedEntries = {}
+        self.LastCommitTime = time.monotonic()
+        self.CommitInterval = 1.0
+
+        # Store Parameters
+        self.CachePath = CachePath
+        self.MaxEntries = MaxEntries
+
+        # Open Database (sqlite3 is imported here, keeping it out of the command line's startup)
+        import sqlite3
+        CacheDirectory = os.path.dirname(os.path.abspath(CachePath))
+        if not os.path.isdir(CacheDirectory):
+            os.makedirs(CacheDirectory)
+        self.Connection = sqlite3.connect(CachePath, check_same_thread=False, timeout=60.0)
+        # Paths are stored as the bytes the filesystem uses, so names that are not valid UTF-8 are cached too
+        self.Connection.execute("CREATE TABLE IF NOT EXISTS Digests (Algorithm TEXT NOT NULL, Path BLOB NOT NULL, Size INTEGER NOT NULL, MTimeNS INTEGER NOT NULL, Inode INTEGER NOT NULL, Digest BLOB NOT NULL, LastUsed INTEGER NOT NULL, PRIMARY KEY (Algorithm, Path))")
+        self.Connection.execute("CREATE INDEX IF NOT EXISTS DigestsLastUsed ON Digests (LastUsed)")
+        self.Connection.commit()
+
+    def Get(self, Algorithm, Path, Stat):
+        Path = os.fsencode(os.path.abspath(Path))
+        with self.Lock:
+            Row = self.Connection.execute("SELECT Digest FROM Digests WHERE Algorithm = ? AND Path = ? AND Size = ? AND MTimeNS = ? AND Inode = ?", (Algorithm, Path, Stat.st_size, Stat.st_mtime_ns, Stat.st_ino)).fetchone()
+            if Row is None:
+                return None
+            self.UsedEntries[(Algorithm, Path)] = time.time_ns()
+            return Row[0]
+
+    def Put(self, Algorithm, Path, Stat, Digest):
+        # Files modified within the last few seconds may change again without their mtime changing
+        if time.time_ns() - Stat.st_mtime_ns < 2000000000:
+            return
+        Path = os.fsencode(os.path.abspath(Path))
+        with self.Lock:
+            self.Connection.execute("INSERT OR REPLACE INTO Digests VALUES (?, ?, ?, ?, ?, ?, ?)", (Algorithm, Path, Stat.st_size, Stat.st_mtime_ns, Stat.st_ino, Digest, time.time_ns()))
+
+            # Commit regularly, so comparisons running at the same time (as in a batch) only hold the database's write lock briefly
+            if time.monotonic() - self.LastCommitTime >= self.CommitInterval:
+                self.Connection.commit()
+                self.LastCommitTime = time.monotonic()
+
+    def Close(self):
+        with self.Lock:
+            # Record Entry Use
+            self.Connection.executemany("UPDATE Digests SET LastUsed = ? WHERE Algorithm = ? AND Path = ?", [(LastUsed, Algorithm, Path) for (Algorithm, Path), LastUsed in self.UsedEntries.items()])
+            self.UsedEntries.clear()
+
+            # Evict Least Recently Used Entries
+            EntryCount = self.Connection.execute("SELECT COUNT(*) FROM Digests").fetchone()[0]
+            if EntryCount > self.MaxEntries:
+                self.Connection.execute("DELETE FROM Digests WHERE rowid IN (SELECT rowid FROM Digests ORDER BY LastUsed LIMIT ?)", (EntryCount - self.MaxEntries,))
+
+            # Commit and Close
+            self.Connection.commit()
+            self.Connection.close()
@@ -0,0 +1,113 @@
+import os
+import queue
+
+from Core.CancellationToken import CheckCancellation
+from Core.DetermineAlgorithm import DetermineAlgorithm
+from Core.DigestCache import DigestCache
+from Core.HashBackends import NewHashObject
+from Core.HashSettings import HashSettings
+from Core.HashThread import HashThread, RaiseHashThreadErrors
+from Core.PrefilterInputs import GetSampleOffsets
+from Core.ProgressReporter import CreateProgressReporter
+from Core.RateLimiter import LimitRate
+from Core.ScanInput import InputScan, ScannedFile, ScanInput
+
+
+def FindDuplicateFiles(Inputs, Algorithm=None, AcrossInputsOnly=False, Settings=None):
+    # Validate Inputs
+    if not Inputs:
+        print("At least one input is needed to search.")
+        return None
+    if not all(os.path.exists(Input) for Input in Inputs):
+        print("At least one input does not exist.")
+        return None
+
+    # Determine Algorithm
+    Algorithm = DetermineAlgorithm(Algorithm)
+    if Algorithm is None:
+        return None
+
+    # Scan Inputs Once, Skipping Files Reached Through More Than One Input
+    Settings = Settings if Settings is not None else HashSettings()
+    ScannedPaths = set()
+    ContentUnits = {}
+    for InputIndex, Input in enumerate(Inputs):
+        for File in ScanInput(Input, CancellationTokenInst=Settings.CancellationTokenInst, MetricsInst=Settings.MetricsInst).Files:
+            AbsolutePath = os.path.abspath(File.Path)
+            if AbsolutePath in ScannedPaths:
+                continue
+            ScannedPaths.add(AbsolutePath)
+
+            # Hard links share one inode, so their contents are identical without reading them
+            UnitKey = (File.Stat.st_dev, File.Stat.st_ino) if File.Stat.st_ino else AbsolutePath
+            ContentUnits.setdefault(UnitKey, {"File": File, "Paths": [], "InputIndices": set()})
+            ContentUnits[UnitKey]["Paths"].append(File.Path)
+            ContentUnits[UnitKey]["InputIndices"].add(InputIndex)
+
+    def IsCandidate(Units):
+        # A group of units is worth reading further only if it could still form a reported group
+        Paths = sum(len(Unit["Paths"]) for Unit in Units)
+        return Paths > 1 and (not AcrossInputsOnly or len(set().union(*(Unit["InputIndices"] for Unit in Units))) > 1)
+
+    # Stage One:  Exact Sizes (files with a unique size cannot have a duplicate)
+    SizeBuckets = {}
+    for Unit in ContentUnits.values():
+        SizeBuckets.setdefault(Unit["File"].Stat.st_size, []).append(Unit)
+    SizeBuckets = {Size: Units for Size, Units in SizeBuckets.items() if IsCandidate(Units)}
+
+    # Stage Two:  Head, Middle, and Tail Samples of Units Sharing a Size
+    ReadBytes = 0
+    SampleBuckets = {}
+    for Size, Units in SizeBuckets.items():
+        # Samples would be a large share of mid-sized files, which go straight to full hashing
+        if len(Units) == 1 or Size == 0 or Settings.PrefilterSampleSize * 2 < Size < Settings.PrefilterSampleMinimumFileSize:
+            SampleBuckets[(Size, None)] = Units
+            continue
+        # Files no larger than two samples are read whole, so their sample digest is already a full digest
+        SampleSize = Size if Size <= Settings.PrefilterSampleSize * 2 else Settings.PrefilterSampleSize
+        SampleOffsets = sorted(set(GetSampleOffsets(Size, SampleSize).values()))
+        for Unit in Units:
+            CheckCancellation(Settings.CancellationTokenInst)
+            LimitRate(Settings.RateLimiterInst, ByteCount=SampleSize * len(SampleOffsets), FileCount=1, CancellationTokenInst=Settings.CancellationTokenInst)
+            HashObject = NewHashObject(Algorithm)
+            with open(Unit["File"].Path, "rb", buffering=0) as OpenedFile:
+                for SampleOffset in SampleOffsets:
+                    HashObject.update(os.pread(OpenedFile.fileno(), SampleSize, SampleOffset))
+            ReadBytes += SampleSize * len(SampleOffsets)
+            SampleBuckets.setdefault((Size, HashObject.digest()), []).append(Unit)
+    SampleBuckets = {SampleKey: Units for SampleKey, Units in SampleBuckets.items() if IsCandidate(Units)}
+
+    # Stage Three:  Full Digests, Only for Units Whose Samples Still Collide
+    FullyHashedUnits = [Unit for (Size, SampleDigest), Units in SampleBuckets.items() if len(Units) > 1 and Size > Settings.PrefilterSampleSize * 2 for Unit in Units]
+    FullDigests = {}
+    if FullyHashedUnits:
+        # Each unit is hashed under its absolute path, so files with the same relative path in different inputs stay apart
+        CandidateScan = InputScan(Inputs[0], None, sorted((ScannedFile(Unit["File"].RelativePath, os.path.abspath(Unit["File"].Path), Unit["File"].Path, Unit["File"].Stat) for Unit in FullyHashedUnits), key=lambda File: File.Path))
+        DigestCacheInst = DigestCache(Settings.DigestCachePath, MaxEntries=Settings.DigestCacheMaxEntries) if Settings.DigestCachePath is not None else None
+        ProgressReporterInst = CreateProgressReporter(Settings, [CandidateScan])
+        CandidateThread = HashThread("HashThreadOne", CandidateScan, queue.Queue(), Algorithm, Settings=Settings, DigestCacheInst=DigestCacheInst, ProgressReporterInst=ProgressReporterInst, InputIndex=0)
+        CandidateThread.start()
+        CandidateThread.join()
+
+        # Close Digest Cache, Keeping Digests Stored Before Any Cancellation
+        if DigestCacheInst is not None:
+            DigestCacheInst.Close()
+        CheckCancellation(Settings.CancellationTokenInst)
+        RaiseHashThreadErrors([CandidateThread])
+
+        # Finish Progress
+        if ProgressReporterInst is not None:
+            ProgressReporterInst.Finish()
+
+        ReadBytes += CandidateScan.TotalSize
+        FullDigests = {ManifestPath: FileEntry["Digest"] for ManifestPath, FileEntry in CandidateThread.Manifest.items()}
+
+    # Group Units by Size and Digest
+    DigestBuckets = {}
+    for (Size, SampleDigest), Units in SampleBuckets.items():
+        for Unit in Units:
+            DigestBuckets.setdefault((Size, SampleDigest, FullDigests.get(os.path.abspath(Unit["File"].Path))), []).append(Unit)
+    Groups = [{"Size": Size, "Files": sorted(Path for Unit in Units for Path in Unit["Paths"])} for (Size, SampleDigest, FullDigest), Units in DigestBuckets.items() if IsCandidate(Units)]
+    Groups.sort(key=lambda Group: (-Group["Size"] * (len(Group["Files"]) - 1), Group["Files"][0]))
+
+    return {"Groups": Groups, "DuplicateFiles": sum(len(Group["Files"]) - 1 for Group in Groups), "DuplicateBytes": sum(Group["Size"] * (len(Group["Files"]) - 1) for Group in Groups), "ScannedFiles": len(ScannedPaths), "ScannedBytes": sum(Unit["File"].Stat.st_size for Unit in ContentUnits.values()), "ReadBytes": ReadBytes}
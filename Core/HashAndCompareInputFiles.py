@@ -1,133 +1,85 @@
-import hashlib
-import json
 import os
 import queue
-import threading
-from math import ceil
 
-
-def HashAndCompareInputFiles(InputOne, InputTwo, Algorithm=None, IgnoreSingleFileNames=True):
+from Core.ArchiveInput import ScanArchive
+from Core.CancellationToken import CheckCancellation
+from Core.DetermineAlgorithm import DetermineAlgorithm
+from Core.DeviceSchedule import CreateDeviceSchedules
+from Core.DigestCache import DigestCache
+from Core.HashSettings import HashSettings
+from Core.HashThread import HashArchiveMemberFile, HashThread, RaiseHashThreadErrors
+from Core.Metrics import MeasureStage
+from Core.PrefilterInputs import PrefilterInputs
+from Core.ProgressReporter import CreateProgressReporter
+from Core.ScanInput import ScanInput
+from Core.ValidateInputs import ValidateInputs
+
+
+def HashAndCompareInputFiles(InputOne, InputTwo, Algorithm=None, IgnoreSingleFileNames=True, Settings=None, ReturnDetails=False):
     # Validate Inputs
-    if not (os.path.exists(InputOne) and os.path.exists(InputTwo)):
-        print("At least one input does not exist.")
-        return None
-    if not ((os.path.isdir(InputOne) and os.path.isdir(InputTwo)) or (os.path.isfile(InputOne) and os.path.isfile(InputTwo))):
-        print("Inputs must both be files or both be directories.")
-        return None
-    if (os.path.isdir(InputOne) or os.path.isdir(InputTwo)) and IgnoreSingleFileNames:
-        print("File names can only be ignored when comparing single files.")
-        return None
-    if InputOne == InputTwo:
-        print("Must select different inputs to compare.")
+    if not ValidateInputs(InputOne, InputTwo, IgnoreSingleFileNames, AllowArchives=True):
         return None
 
+    def Result(Identical, Stage, Reason=None):
+        return {"Identical": Identical, "Stage": Stage, "Reason": Reason} if ReturnDetails else Identical
+
     # Check for Identical File Names When Not Ignoring File Names
     if os.path.isfile(InputOne) and os.path.isfile(InputTwo) and not IgnoreSingleFileNames:
         if os.path.basename(InputOne) != os.path.basename(InputTwo):
-            return False
-
-    # Check File Sizes
-    def GetFileSize(Input):
-        if os.path.isfile(Input):
-            return os.path.getsize(Input)
-        elif os.path.isdir(Input):
-            CurrentTotal = 0
-            for File in os.listdir(Input):
-                CurrentTotal += GetFileSize(os.path.join(Input, File))
-            return CurrentTotal
-        else:
-            return None
-
-    InputOneSize = GetFileSize(InputOne)
-    InputTwoSize = GetFileSize(InputTwo)
-
-    if InputOneSize is None or InputTwoSize is None:
-        print("An error occurred determining file size.  Comparison not completed.")
-        return None
-
-    if InputOneSize != InputTwoSize:
-        return False
+            return Result(False, "Names", "The file names differ.")
 
     # Determine Algorithm
-    AvailableAlgorithms = sorted(list(hashlib.algorithms_available))
-    DefaultAlgorithm = None
-    DefaultAlgorithmOptions = ("md5", "sha1")
-    for DefaultAlgorithmOption in DefaultAlgorithmOptions:
-        if DefaultAlgorithmOption in AvailableAlgorithms:
-            DefaultAlgorithm = DefaultAlgorithmOption
-            break
+    Algorithm = DetermineAlgorithm(Algorithm)
     if Algorithm is None:
-        if DefaultAlgorithm is not None:
-            Algorithm = DefaultAlgorithm
-        else:
-            print(f"No default algorithm is present.  Available algorithms:\n\n{str(AvailableAlgorithms)}")
-            return None
-    if Algorithm not in AvailableAlgorithms:
-        print(f"Algorithm not available.  Available algorithms:\n\n{str(AvailableAlgorithms)}")
         return None
 
-    # Hash Inputs
-    class HashThread(threading.Thread):
-        def __init__(self, Name, Input, InputSize, ResultQueue):
-            # Variables
-            self.ChunkSize = 65536
-            self.HashedBytes = 0
-            self.HashComplete = False
+    # Scan Inputs (a zip or tar archive compared with a directory is scanned as the tree it would extract to, and its members are hashed straight from the archive, during the scan for compressed tar archives and later otherwise; symbolic links are skipped on both sides)
+    Settings = Settings if Settings is not None else HashSettings()
+    InputOneIsArchive = os.path.isfile(InputOne) and os.path.isdir(InputTwo)
+    InputTwoIsArchive = os.path.isfile(InputTwo) and os.path.isdir(InputOne)
 
-            # Store Parameters
-            self.Input = Input
-            self.InputSize = ceil(InputSize / self.ChunkSize) * self.ChunkSize
-            self.ResultQueue = ResultQueue
+    def HashMember(Archive, MemberPath, MemberFile, MemberSize):
+        return HashArchiveMemberFile(Archive, MemberPath, MemberFile, MemberSize, Algorithm, Settings)
 
-            # Initialize
-            super().__init__(name=Name, daemon=True)
+    InputOneScan = ScanArchive(InputOne, InputTwo, CancellationTokenInst=Settings.CancellationTokenInst, MetricsInst=Settings.MetricsInst, HashMember=HashMember) if InputOneIsArchive else ScanInput(InputOne, CancellationTokenInst=Settings.CancellationTokenInst, MetricsInst=Settings.MetricsInst, FollowSymlinks=not InputTwoIsArchive)
+    InputTwoScan = ScanArchive(InputTwo, InputOne, CancellationTokenInst=Settings.CancellationTokenInst, MetricsInst=Settings.MetricsInst, HashMember=HashMember) if InputTwoIsArchive else ScanInput(InputTwo, CancellationTokenInst=Settings.CancellationTokenInst, MetricsInst=Settings.MetricsInst, FollowSymlinks=not InputOneIsArchive)
 
-        def run(self):
-            InputDirectory = os.path.dirname(self.Input)
-            RelativeInputPath = os.path.basename(self.Input)
-            FilePaths = []
+    # Check Total Sizes
+    if InputOneScan.TotalSize != InputTwoScan.TotalSize:
+        return Result(False, "Sizes", f"The total sizes differ ({InputOneScan.TotalSize} and {InputTwoScan.TotalSize} bytes).")
 
-            def MapFilePaths(InputDirectory, RelativeInputPath, FilePaths):
-                CurrentFile = os.path.join(InputDirectory, RelativeInputPath)
-                if os.path.isfile(CurrentFile):
-                    FilePaths.append(RelativeInputPath)
-                elif os.path.isdir(CurrentFile):
-                    for File in os.listdir(CurrentFile):
-                        MapFilePaths(InputDirectory, os.path.join(RelativeInputPath, File), FilePaths)
+    # Check Per-File Sizes and Samples
+    with MeasureStage(Settings.MetricsInst, "Prefilter"):
+        Rejection = PrefilterInputs(InputOneScan, InputTwoScan, IgnoreSingleFileNames=IgnoreSingleFileNames, Settings=Settings)
+    if Rejection is not None:
+        return Result(False, Rejection["Stage"], Rejection["Reason"])
 
-            MapFilePaths(InputDirectory, RelativeInputPath, FilePaths)
+    # Open Digest Cache
+    DigestCacheInst = DigestCache(Settings.DigestCachePath, MaxEntries=Settings.DigestCacheMaxEntries) if Settings.DigestCachePath is not None else None
 
-            FilePaths.sort()
-
-            # Create Hash Object
-            HashObject = hashlib.new(Algorithm)
-
-            # Hash Files in File Paths
-            for File in [os.path.join(InputDirectory, RelativeFile) for RelativeFile in FilePaths]:
-                with open(File, "rb") as OpenedFile:
-                    while OpenedFileChunk := OpenedFile.read(self.ChunkSize):
-                        HashObject.update(OpenedFileChunk)
-                        self.HashedBytes += self.ChunkSize
-
-            # Hash File Paths
-            if not IgnoreSingleFileNames:
-                HashObject.update(bytes(json.dumps(FilePaths), "utf-8"))
-
-            # Put Hash Digest in Result Queue
-            self.ResultQueue.put(HashObject.digest())
-
-            # Flag Hash Complete
-            self.HashComplete = True
+    # Create Progress Reporter
+    ProgressReporterInst = CreateProgressReporter(Settings, [InputOneScan, InputTwoScan])
 
     # Check Inputs in Threads
+    DeviceSchedules = CreateDeviceSchedules([InputOneScan, InputTwoScan], Settings)
     ResultQueue = queue.Queue()
-    InputOneThread = HashThread("HashThreadOne", InputOne, InputOneSize, ResultQueue)
+    InputOneThread = HashThread("HashThreadOne", InputOneScan, ResultQueue, Algorithm, IgnoreSingleFileNames=IgnoreSingleFileNames, Settings=Settings, DigestCacheInst=DigestCacheInst, ProgressReporterInst=ProgressReporterInst, InputIndex=0, DeviceScheduleInst=DeviceSchedules[0])
     InputOneThread.start()
-    InputTwoThread = HashThread("HashThreadTwo", InputTwo, InputTwoSize, ResultQueue)
+    InputTwoThread = HashThread("HashThreadTwo", InputTwoScan, ResultQueue, Algorithm, IgnoreSingleFileNames=IgnoreSingleFileNames, Settings=Settings, DigestCacheInst=DigestCacheInst, ProgressReporterInst=ProgressReporterInst, InputIndex=1, DeviceScheduleInst=DeviceSchedules[1])
     InputTwoThread.start()
     InputOneThread.join()
     InputTwoThread.join()
+
+    # Close Digest Cache, Keeping Digests Stored Before Any Cancellation
+    if DigestCacheInst is not None:
+        DigestCacheInst.Close()
+    CheckCancellation(Settings.CancellationTokenInst)
+    RaiseHashThreadErrors([InputOneThread, InputTwoThread])
     DigestOne = ResultQueue.get()
     DigestTwo = ResultQueue.get()
 
-    return DigestOne == DigestTwo
+    # Finish Progress
+    if ProgressReporterInst is not None:
+        ProgressReporterInst.Finish()
+
+    return Result(DigestOne == DigestTwo, "Hashes", None if DigestOne == DigestTwo else "The digests differ.")
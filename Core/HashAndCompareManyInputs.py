@@ -0,0 +1,71 @@
+import os
+import queue
+
+from Core.CancellationToken import CheckCancellation
+from Core.DetermineAlgorithm import DetermineAlgorithm
+from Core.DeviceSchedule import CreateDeviceSchedules
+from Core.DigestCache import DigestCache
+from Core.HashSettings import HashSettings
+from Core.HashThread import HashThread, RaiseHashThreadErrors
+from Core.ProgressReporter import CreateProgressReporter
+from Core.ScanInput import ScanInput
+from Core.ValidateInputs import ValidateManyInputs
+
+
+def HashAndCompareManyInputs(Inputs, Algorithm=None, IgnoreSingleFileNames=True, Settings=None):
+    # Validate Inputs
+    if not ValidateManyInputs(Inputs, IgnoreSingleFileNames=IgnoreSingleFileNames):
+        return None
+
+    # Determine Algorithm
+    Algorithm = DetermineAlgorithm(Algorithm)
+    if Algorithm is None:
+        return None
+
+    # Scan Inputs
+    Settings = Settings if Settings is not None else HashSettings()
+    InputScans = [ScanInput(Input, CancellationTokenInst=Settings.CancellationTokenInst, MetricsInst=Settings.MetricsInst) for Input in Inputs]
+
+    # Group Inputs by Total Size and File Names, Which Must Match Before Contents Can
+    CandidateGroups = {}
+    for InputScanInst in InputScans:
+        CandidateKey = (InputScanInst.TotalSize, None if IgnoreSingleFileNames else os.path.basename(InputScanInst.Input))
+        CandidateGroups.setdefault(CandidateKey, []).append(InputScanInst)
+
+    # Only inputs that share a candidate group with another input need to be hashed
+    HashedScans = [InputScanInst for CandidateGroup in CandidateGroups.values() if len(CandidateGroup) > 1 for InputScanInst in CandidateGroup]
+
+    # Open Digest Cache
+    DigestCacheInst = DigestCache(Settings.DigestCachePath, MaxEntries=Settings.DigestCacheMaxEntries) if Settings.DigestCachePath is not None else None
+
+    # Create Progress Reporter
+    ProgressReporterInst = CreateProgressReporter(Settings, HashedScans)
+
+    # Hash Inputs in Threads, Each Input Read Once (inputs sharing a device take turns)
+    DeviceSchedules = CreateDeviceSchedules(HashedScans, Settings)
+    ResultQueue = queue.Queue()
+    InputThreads = [HashThread(f"HashThread{InputIndex + 1}", InputScanInst, ResultQueue, Algorithm, IgnoreSingleFileNames=IgnoreSingleFileNames, Settings=Settings, DigestCacheInst=DigestCacheInst, ProgressReporterInst=ProgressReporterInst, InputIndex=InputIndex, DeviceScheduleInst=DeviceSchedules[InputIndex]) for InputIndex, InputScanInst in enumerate(HashedScans)]
+    for InputThread in InputThreads:
+        InputThread.start()
+    for InputThread in InputThreads:
+        InputThread.join()
+    Digests = {InputThread.Input: InputThread.Digest for InputThread in InputThreads}
+
+    # Close Digest Cache, Keeping Digests Stored Before Any Cancellation
+    if DigestCacheInst is not None:
+        DigestCacheInst.Close()
+    CheckCancellation(Settings.CancellationTokenInst)
+    RaiseHashThreadErrors(InputThreads)
+
+    # Finish Progress
+    if ProgressReporterInst is not None:
+        ProgressReporterInst.Finish()
+
+    # Group Inputs into Equivalence Classes, in Input Order
+    Groups = {}
+    for InputScanInst in InputScans:
+        CandidateKey = (InputScanInst.TotalSize, None if IgnoreSingleFileNames else os.path.basename(InputScanInst.Input))
+        GroupKey = (CandidateKey, Digests.get(InputScanInst.Input, InputScanInst.Input))
+        Groups.setdefault(GroupKey, []).append(InputScanInst.Input)
+
+    return {"Identical": len(Groups) == 1, "Groups": list(Groups.values()), "Digests": {Input: Digest.hex() for Input, Digest in Digests.items()}}
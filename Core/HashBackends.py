@@ -0,0 +1,84 @@
+import hashlib
+
+# Registered Backends (algorithm name to a function returning a new hash object)
+HashBackends = {}
+
+# Aliases (alias to the algorithms it resolves to, in order of preference)
+HashAliases = {"fast": ("blake3", "xxh3_128", "blake2b")}
+
+DefaultAlgorithmOptions = ("md5", "sha1")
+
+
+class FixedLengthHashObject:
+    # Extendable-output algorithms (shake_128, shake_256) need a digest length
+    def __init__(self, HashObject, DigestLength):
+        self.HashObject = HashObject
+        self.DigestLength = DigestLength
+
+    def update(self, Data):
+        self.HashObject.update(Data)
+
+    def digest(self):
+        return self.HashObject.digest(self.DigestLength)
+
+    def hexdigest(self):
+        return self.HashObject.hexdigest(self.DigestLength)
+
+
+def RegisterHashBackend(Algorithm, Factory):
+    HashBackends[Algorithm] = Factory
+
+
+def GetAvailableAlgorithms():
+    return sorted(HashBackends.keys())
+
+
+def GetSelectableAlgorithms():
+    return sorted(list(HashBackends.keys()) + [Alias for Alias in HashAliases if ResolveAlgorithm(Alias) is not None])
+
+
+def GetDefaultAlgorithm():
+    for DefaultAlgorithmOption in DefaultAlgorithmOptions:
+        if DefaultAlgorithmOption in HashBackends:
+            return DefaultAlgorithmOption
+    return None
+
+
+def ResolveAlgorithm(Algorithm):
+    for AliasedAlgorithm in HashAliases.get(Algorithm, (Algorithm,)):
+        if AliasedAlgorithm in HashBackends:
+            return AliasedAlgorithm
+    return None
+
+
+def NewHashObject(Algorithm):
+    return HashBackends[Algorithm]()
+
+
+# Register hashlib Backends
+def CreateHashlibFactory(Algorithm):
+    if Algorithm.startswith("shake_"):
+        return lambda: FixedLengthHashObject(hashlib.new(Algorithm), 32 if Algorithm == "shake_128" else 64)
+    return lambda: hashlib.new(Algorithm)
+
+
+for HashlibAlgorithm in hashlib.algorithms_available:
+    RegisterHashBackend(HashlibAlgorithm, CreateHashlibFactory(HashlibAlgorithm))
+
+# Register Optional BLAKE3 Backend (hashes large updates on multiple threads)
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+if blake3 is not None:
+    RegisterHashBackend("blake3", lambda: blake3.blake3(max_threads=blake3.blake3.AUTO))
+
+# Register Optional xxHash Backends (non-cryptographic, for change detection on trusted storage)
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+if xxhash is not None:
+    RegisterHashBackend("xxh3_64", xxhash.xxh3_64)
+    RegisterHashBackend("xxh3_128", xxhash.xxh3_128)
+    RegisterHashBackend("xxh64", xxhash.xxh64)
@@ -0,0 +1,55 @@
+from Core.Metrics import ComparisonMetrics
+from Core.RateLimiter import RateLimiter
+
+
+class HashSettings:
+    def __init__(self, Workers=1, ChunkSize=None, UseMemoryMap=True, DigestCachePath=None, DigestCacheMaxEntries=1000000, UsePrefilterSamples=True, MerkleBlockSize=4194304, MerkleTreeDirectory=None, ProgressCallback=None, ProgressInterval=0.1, CancellationTokenInst=None, MaxBytesPerSecond=None, MaxFilesPerSecond=None, UseLowIOPriority=False, ReadMode="Buffered", DeviceScheduling="Auto", CollectMetrics=False, Profile=False):
+        # Hashing
+        self.Workers = max(1, Workers)
+
+        # Reading (a chunk size of None adapts to each file's size and block size; empty reads would end every file at once, so sizes must be positive)
+        if ChunkSize is not None and ChunkSize <= 0:
+            raise ValueError(f"The chunk size must be a positive number of bytes, not {ChunkSize}.")
+        self.ChunkSize = ChunkSize
+        self.MinimumChunkSize = 65536
+        self.MaximumChunkSize = 4194304
+
+        # Read Mode (streaming reads drop hashed pages from the page cache, and direct reads bypass it where the filesystem allows, falling back to streaming)
+        self.ReadMode = ReadMode
+
+        # Device Scheduling (inputs on the same seeking device take turns reading extents this large instead of both reading at once; auto interleaves only devices reported as rotational)
+        self.DeviceScheduling = DeviceScheduling
+        self.InterleaveExtentSize = 33554432
+
+        # Memory Mapping (in buffered mode, regular files at least this large are hashed from a memory map instead of read)
+        self.UseMemoryMap = UseMemoryMap
+        self.MemoryMapThreshold = 67108864
+
+        # Digest Cache
+        self.DigestCachePath = DigestCachePath
+        self.DigestCacheMaxEntries = DigestCacheMaxEntries
+
+        # Prefilter (files at least this large are sampled at the head, middle, and tail before full hashing)
+        self.UsePrefilterSamples = UsePrefilterSamples
+        self.PrefilterSampleSize = 16384
+        self.PrefilterSampleMinimumFileSize = 1048576
+
+        # Merkle Trees (blocks of each file are hashed in parallel; trees can be stored in a directory and reused while files are unchanged)
+        self.MerkleBlockSize = MerkleBlockSize
+        self.MerkleTreeDirectory = MerkleTreeDirectory
+
+        # Progress (the callback receives a list with the progress of each input, at most once per interval)
+        self.ProgressCallback = ProgressCallback
+        self.ProgressInterval = ProgressInterval
+
+        # Cancellation (readers check the token between chunks and files, pausing or stopping the comparison)
+        self.CancellationTokenInst = CancellationTokenInst
+
+        # Throttling (one token bucket per limit is shared by every reader; the idle I/O class is applied by the front ends to their comparison thread on Linux)
+        self.MaxBytesPerSecond = MaxBytesPerSecond
+        self.MaxFilesPerSecond = MaxFilesPerSecond
+        self.RateLimiterInst = RateLimiter(BytesPerSecond=MaxBytesPerSecond, FilesPerSecond=MaxFilesPerSecond) if MaxBytesPerSecond or MaxFilesPerSecond else None
+        self.UseLowIOPriority = UseLowIOPriority
+
+        # Metrics (stage timers, counters, open latencies, and the slowest files; profiling adds a cProfile of every reading thread)
+        self.MetricsInst = ComparisonMetrics(Profile=Profile) if CollectMetrics or Profile else None
@@ -0,0 +1,334 @@
+import collections
+import errno
+import json
+import mmap
+import os
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from Core.ArchiveInput import ArchiveMemberStat, GetArchiveErrors, IterateArchiveMembers
+from Core.CancellationToken import CheckCancellation, ComparisonCancelled
+from Core.HashBackends import NewHashObject
+from Core.HashSettings import HashSettings
+from Core.Metrics import FileTimer, MeasureStage, ProfileThread, TimeCall
+from Core.PageCache import AdviseSequentialRead, DirectReadAlignment, GetAlignedBuffer, OpenDirect, ReleaseReadRange
+from Core.RateLimiter import LimitRate
+from Core.ScanInput import ScannedFile
+
+
+def CombineFileDigests(Algorithm, FileDigests, FilePaths, IgnoreSingleFileNames=True):
+    # File digests are folded in sorted file path order, followed by the file paths unless names are ignored
+    if IgnoreSingleFileNames and len(FileDigests) == 1:
+        return FileDigests[0]
+    HashObject = NewHashObject(Algorithm)
+    for FileDigest in FileDigests:
+        HashObject.update(FileDigest)
+
+    # Hash File Paths
+    if not IgnoreSingleFileNames:
+        HashObject.update(bytes(json.dumps(FilePaths), "utf-8"))
+
+    return HashObject.digest()
+
+
+class HashThread(threading.Thread):
+    def __init__(self, Name, InputScanInst, ResultQueue, Algorithm, IgnoreSingleFileNames=True, Settings=None, DigestCacheInst=None, ProgressReporterInst=None, InputIndex=0, DeviceScheduleInst=None):
+        # Variables
+        self.ReadBuffers = threading.local()
+        self.HashComplete = False
+        self.Cancelled = False
+        self.Error = None
+        self.Digest = None
+        self.Manifest = {}
+
+        # Store Parameters
+        self.InputScanInst = InputScanInst
+        self.Input = InputScanInst.Input
+        self.InputSize = InputScanInst.TotalSize
+        self.ResultQueue = ResultQueue
+        self.Algorithm = Algorithm
+        self.IgnoreSingleFileNames = IgnoreSingleFileNames
+        self.Settings = Settings if Settings is not None else HashSettings()
+        self.DigestCacheInst = DigestCacheInst
+        self.ProgressReporterInst = ProgressReporterInst
+        self.InputIndex = InputIndex
+        self.DeviceScheduleInst = DeviceScheduleInst
+
+        # Initialize
+        super().__init__(name=Name, daemon=True)
+
+    def run(self):
+        try:
+            with MeasureStage(self.Settings.MetricsInst, "Hash"), ProfileThread(self.Settings.MetricsInst):
+                self.HashFiles()
+        except ComparisonCancelled:
+            # Callers still receive a result, so they never wait on a stopped thread
+            self.Cancelled = True
+            self.ResultQueue.put(None)
+        except Exception as Error:
+            # The error is raised again in the calling thread by RaiseHashThreadErrors, so the caller never waits on a thread that stopped without a result
+            self.Error = Error
+            self.ResultQueue.put(None)
+        finally:
+            if self.DeviceScheduleInst is not None:
+                self.DeviceScheduleInst.Release(self.InputIndex)
+
+    def HashFiles(self):
+        # Hash Scanned Files
+        FileDigests = []
+
+        def AddFileResult(File, FileDigest, ReportProgress=True):
+            FileDigests.append(FileDigest)
+            if ReportProgress and self.ProgressReporterInst is not None:
+                self.ProgressReporterInst.FileDone(self.InputIndex, File)
+            self.Manifest[File.ManifestPath] = {"Size": File.Stat.st_size, "Digest": FileDigest.hex()}
+
+        if self.InputScanInst.ArchiveType is not None:
+            # Archive members are hashed in the order they are stored and combined in sorted file path order, like files on disk
+            MemberDigests = self.HashArchiveMembers()
+            for File in self.InputScanInst.Files:
+                AddFileResult(File, MemberDigests[File.Member], ReportProgress=False)
+        elif self.Settings.Workers == 1:
+            for File in self.InputScanInst.Files:
+                AddFileResult(File, self.HashFile(File))
+        else:
+            # Results are collected in submission order, so the combined digest stays in sorted file path order
+            with ThreadPoolExecutor(max_workers=self.Settings.Workers, thread_name_prefix=f"{self.name}Worker") as Executor:
+                PendingFiles = collections.deque()
+                for File in self.InputScanInst.Files:
+                    PendingFiles.append((File, Executor.submit(self.HashFileInWorker, File)))
+                    if len(PendingFiles) >= self.Settings.Workers * 4:
+                        PendingFile, PendingFuture = PendingFiles.popleft()
+                        AddFileResult(PendingFile, PendingFuture.result())
+                while PendingFiles:
+                    PendingFile, PendingFuture = PendingFiles.popleft()
+                    AddFileResult(PendingFile, PendingFuture.result())
+
+        # Combine File Digests
+        Digest = CombineFileDigests(self.Algorithm, FileDigests, self.InputScanInst.FilePaths, IgnoreSingleFileNames=self.IgnoreSingleFileNames)
+
+        # Put Hash Digest in Result Queue
+        self.Digest = Digest
+        self.ResultQueue.put(Digest)
+
+        # Flag Hash Complete
+        self.HashComplete = True
+
+    def HashFileInWorker(self, File):
+        with ProfileThread(self.Settings.MetricsInst):
+            return self.HashFile(File)
+
+    def AddHashedBytes(self, ByteCount):
+        if self.ProgressReporterInst is not None:
+            self.ProgressReporterInst.BytesHashed(self.InputIndex, ByteCount)
+
+    def WaitForDeviceTurn(self, ByteCount):
+        # Inputs sharing a device take turns reading long extents, instead of the disk seeking between them on every chunk
+        if self.DeviceScheduleInst is not None:
+            self.DeviceScheduleInst.Acquire(self.InputIndex, ByteCount, self.Settings.CancellationTokenInst)
+
+    def GetChunkSize(self, File):
+        if self.Settings.ChunkSize is not None:
+            return self.Settings.ChunkSize
+
+        # Scale to File Size, Rounded Up to a Whole Number of Filesystem Blocks
+        BlockSize = getattr(File.Stat, "st_blksize", 4096) or 4096
+        ChunkSize = min(self.Settings.MaximumChunkSize, max(self.Settings.MinimumChunkSize, File.Stat.st_size // 16))
+        return -(-ChunkSize // BlockSize) * BlockSize
+
+    def GetReadBuffer(self, ChunkSize):
+        # Each worker thread reuses one buffer, grown as needed, so reading allocates nothing per chunk
+        if getattr(self.ReadBuffers, "Buffer", None) is None or len(self.ReadBuffers.Buffer) < ChunkSize:
+            self.ReadBuffers.Buffer = bytearray(ChunkSize)
+            self.ReadBuffers.View = memoryview(self.ReadBuffers.Buffer)
+        return self.ReadBuffers.View[:ChunkSize]
+
+    def GetDirectReadBuffer(self, ChunkSize):
+        if getattr(self.ReadBuffers, "DirectBuffer", None) is None or len(self.ReadBuffers.DirectBuffer) < ChunkSize:
+            self.ReadBuffers.DirectView = None
+            self.ReadBuffers.DirectBuffer = GetAlignedBuffer(ChunkSize)
+            self.ReadBuffers.DirectView = memoryview(self.ReadBuffers.DirectBuffer)
+        return self.ReadBuffers.DirectView[:ChunkSize]
+
+    def HashReadFile(self, File, OpenedFile, HashObject, FileTimerInst=None):
+        ReadBuffer = self.GetReadBuffer(self.GetChunkSize(File))
+        AdviseSequentialRead(self.Settings.ReadMode, OpenedFile.fileno())
+        Offset = 0
+        while True:
+            self.WaitForDeviceTurn(len(ReadBuffer))
+            ReadCount = TimeCall(FileTimerInst, "Read", OpenedFile.readinto, ReadBuffer)
+            if not ReadCount:
+                break
+            CheckCancellation(self.Settings.CancellationTokenInst)
+            LimitRate(self.Settings.RateLimiterInst, ByteCount=ReadCount, CancellationTokenInst=self.Settings.CancellationTokenInst)
+            HashObject.update(ReadBuffer[:ReadCount])
+            ReleaseReadRange(self.Settings.ReadMode, OpenedFile.fileno(), Offset, ReadCount)
+            Offset += ReadCount
+            self.AddHashedBytes(ReadCount)
+
+    def HashDirectFile(self, File, HashObject, FileTimerInst=None):
+        if not stat.S_ISREG(File.Stat.st_mode):
+            return False
+
+        # Open Without the Page Cache, Falling Back to Streaming Reads if the Filesystem Does Not Allow It
+        FileDescriptor = TimeCall(FileTimerInst, "Open", OpenDirect, File.Path)
+        if FileDescriptor is None:
+            return False
+
+        # Read Aligned Chunks into an Aligned Buffer
+        ChunkSize = -(-self.GetChunkSize(File) // DirectReadAlignment) * DirectReadAlignment
+        ReadBuffer = self.GetDirectReadBuffer(ChunkSize)
+        Offset = 0
+        try:
+            while True:
+                CheckCancellation(self.Settings.CancellationTokenInst)
+                self.WaitForDeviceTurn(ChunkSize)
+                try:
+                    ReadCount = TimeCall(FileTimerInst, "Read", os.readv, FileDescriptor, [ReadBuffer])
+                except OSError as Error:
+                    if Offset == 0 and Error.errno == errno.EINVAL:
+                        return False
+                    raise
+                if ReadCount == 0:
+                    break
+                LimitRate(self.Settings.RateLimiterInst, ByteCount=ReadCount, CancellationTokenInst=self.Settings.CancellationTokenInst)
+                HashObject.update(ReadBuffer[:ReadCount])
+                Offset += ReadCount
+                self.AddHashedBytes(ReadCount)
+        finally:
+            os.close(FileDescriptor)
+        return True
+
+    def HashMappedFile(self, File, OpenedFile, HashObject):
+        if self.Settings.ReadMode != "Buffered" or not self.Settings.UseMemoryMap or File.Stat.st_size < self.Settings.MemoryMapThreshold or not stat.S_ISREG(File.Stat.st_mode):
+            return False
+
+        # Map File, Falling Back to Reading if the File or Filesystem Cannot Be Mapped
+        try:
+            MappedFile = mmap.mmap(OpenedFile.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError, OverflowError):
+            return False
+
+        # Hash Mapped Slices
+        ChunkSize = self.GetChunkSize(File)
+        with MappedFile:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                MappedFile.madvise(mmap.MADV_SEQUENTIAL)
+            with memoryview(MappedFile) as MappedView:
+                for Offset in range(0, len(MappedView), ChunkSize):
+                    CheckCancellation(self.Settings.CancellationTokenInst)
+                    self.WaitForDeviceTurn(min(ChunkSize, len(MappedView) - Offset))
+                    LimitRate(self.Settings.RateLimiterInst, ByteCount=min(ChunkSize, len(MappedView) - Offset), CancellationTokenInst=self.Settings.CancellationTokenInst)
+                    with MappedView[Offset:Offset + ChunkSize] as MappedChunk:
+                        HashObject.update(MappedChunk)
+                        self.AddHashedBytes(len(MappedChunk))
+        return True
+
+    def HashArchiveMembers(self):
+        # Members are streamed straight from the archive into the hash, one at a time, without extracting them; members of compressed tar archives were already hashed while the archive was scanned
+        if self.InputScanInst.MemberDigests is not None:
+            for File in self.InputScanInst.Files:
+                self.AddHashedBytes(File.Stat.st_size)
+                if self.ProgressReporterInst is not None:
+                    self.ProgressReporterInst.FileDone(self.InputIndex, File)
+            return self.InputScanInst.MemberDigests
+        FilesByMember = {}
+        for File in self.InputScanInst.Files:
+            FilesByMember.setdefault(File.Member, []).append(File)
+        MemberDigests = {}
+        try:
+            for MemberName, MemberFile in IterateArchiveMembers(self.Input, self.InputScanInst.ArchiveType, FilesByMember):
+                MemberDigests[MemberName] = self.HashArchiveMember(FilesByMember[MemberName], MemberFile)
+        except GetArchiveErrors() as Error:
+            raise OSError(f"{self.Input} could not be read as an archive:  {Error}") from Error
+        if len(MemberDigests) != len(FilesByMember):
+            raise OSError(f"{self.Input} changed while it was compared.")
+        return MemberDigests
+
+    def HashArchiveMember(self, Files, MemberFile):
+        # Hard links within a tar archive share one member, which is read once for all of them
+        CheckCancellation(self.Settings.CancellationTokenInst)
+        if self.ProgressReporterInst is not None:
+            self.ProgressReporterInst.FileStarted(self.InputIndex, Files[0])
+        LimitRate(self.Settings.RateLimiterInst, FileCount=1, CancellationTokenInst=self.Settings.CancellationTokenInst)
+        FileTimerInst = FileTimer() if self.Settings.MetricsInst is not None else None
+        HashObject = NewHashObject(self.Algorithm)
+        ReadBuffer = self.GetReadBuffer(self.GetChunkSize(Files[0]))
+        while True:
+            self.WaitForDeviceTurn(len(ReadBuffer))
+            ReadCount = TimeCall(FileTimerInst, "Read", MemberFile.readinto, ReadBuffer)
+            if not ReadCount:
+                break
+            CheckCancellation(self.Settings.CancellationTokenInst)
+            LimitRate(self.Settings.RateLimiterInst, ByteCount=ReadCount, CancellationTokenInst=self.Settings.CancellationTokenInst)
+            HashObject.update(ReadBuffer[:ReadCount])
+            self.AddHashedBytes(ReadCount)
+        if FileTimerInst is not None:
+            self.Settings.MetricsInst.RecordFile(Files[0], FileTimerInst)
+
+        # Report Every File of the Member Done
+        for File in Files[1:]:
+            self.AddHashedBytes(File.Stat.st_size)
+        if self.ProgressReporterInst is not None:
+            for File in Files:
+                self.ProgressReporterInst.FileDone(self.InputIndex, File)
+        return HashObject.digest()
+
+    def HashFile(self, File):
+        CheckCancellation(self.Settings.CancellationTokenInst)
+        if self.ProgressReporterInst is not None:
+            self.ProgressReporterInst.FileStarted(self.InputIndex, File)
+
+        # Check Digest Cache
+        if self.DigestCacheInst is not None:
+            CachedDigest = self.DigestCacheInst.Get(self.Algorithm, File.Path, File.Stat)
+            if CachedDigest is not None:
+                self.AddHashedBytes(File.Stat.st_size)
+                if self.Settings.MetricsInst is not None:
+                    self.Settings.MetricsInst.AddCount("CacheHits")
+                return CachedDigest
+
+        # Hash File
+        LimitRate(self.Settings.RateLimiterInst, FileCount=1, CancellationTokenInst=self.Settings.CancellationTokenInst)
+        FileTimerInst = FileTimer() if self.Settings.MetricsInst is not None else None
+        HashObject = NewHashObject(self.Algorithm)
+        if not (self.Settings.ReadMode == "Direct" and self.HashDirectFile(File, HashObject, FileTimerInst)):
+            with TimeCall(FileTimerInst, "Open", open, File.Path, "rb", buffering=0) as OpenedFile:
+                if not self.HashMappedFile(File, OpenedFile, HashObject):
+                    self.HashReadFile(File, OpenedFile, HashObject, FileTimerInst)
+        Digest = HashObject.digest()
+        if FileTimerInst is not None:
+            self.Settings.MetricsInst.RecordFile(File, FileTimerInst)
+
+        # Store Digest in Cache
+        if self.DigestCacheInst is not None:
+            self.DigestCacheInst.Put(self.Algorithm, File.Path, File.Stat, Digest)
+
+        return Digest
+
+
+def HashArchiveMemberFile(Archive, MemberPath, MemberFile, MemberSize, Algorithm, Settings):
+    # Hashes one member while ScanArchive lists a compressed tar archive, which can only be decompressed in one forward pass
+    CheckCancellation(Settings.CancellationTokenInst)
+    LimitRate(Settings.RateLimiterInst, FileCount=1, CancellationTokenInst=Settings.CancellationTokenInst)
+    FileTimerInst = FileTimer() if Settings.MetricsInst is not None else None
+    HashObject = NewHashObject(Algorithm)
+    ReadBuffer = memoryview(bytearray(Settings.ChunkSize if Settings.ChunkSize is not None else min(Settings.MaximumChunkSize, max(Settings.MinimumChunkSize, MemberSize // 16))))
+    while True:
+        ReadCount = TimeCall(FileTimerInst, "Read", MemberFile.readinto, ReadBuffer)
+        if not ReadCount:
+            break
+        CheckCancellation(Settings.CancellationTokenInst)
+        LimitRate(Settings.RateLimiterInst, ByteCount=ReadCount, CancellationTokenInst=Settings.CancellationTokenInst)
+        HashObject.update(ReadBuffer[:ReadCount])
+    if FileTimerInst is not None:
+        Settings.MetricsInst.RecordFile(ScannedFile(MemberPath, MemberPath, os.path.join(Archive, MemberPath), ArchiveMemberStat(MemberSize)), FileTimerInst)
+    return HashObject.digest()
+
+
+def RaiseHashThreadErrors(HashThreads):
+    # Reading and other errors are raised in the caller instead of leaving it with a missing digest
+    for HashThreadInst in HashThreads:
+        if HashThreadInst.Error is not None:
+            raise HashThreadInst.Error
@@ -0,0 +1,270 @@
+import os
+import queue
+import time
+
+from Core.CancellationToken import CheckCancellation
+from Core.CompareManifests import CompareManifests
+from Core.DetermineAlgorithm import DetermineAlgorithm
+from Core.DigestCache import DigestCache
+from Core.HashBackends import NewHashObject, ResolveAlgorithm
+from Core.HashSettings import HashSettings
+from Core.HashThread import CombineFileDigests, HashThread, RaiseHashThreadErrors
+from Core.ProgressReporter import CreateProgressReporter
+from Core.ScanInput import InputScan, ScanInput
+
+# Database Manifest Extensions (other manifest files are written as sha256sum-compatible text)
+DatabaseManifestExtensions = (".sqlite3", ".db")
+
+# Text Manifest Algorithms (text manifests record their algorithm in a comment line; manifests without one, such as sha256sum output, are read by their extension or digest length)
+TextManifestAlgorithmPrefix = "# algorithm: "
+TextManifestDigestLengths = {32: "md5", 40: "sha1", 56: "sha224", 64: "sha256", 96: "sha384", 128: "sha512"}
+
+
+def IsDatabaseManifest(ManifestFilePath):
+    return os.path.splitext(ManifestFilePath)[1].lower() in DatabaseManifestExtensions
+
+
+def GetExtensionAlgorithm(ManifestFilePath):
+    # Text manifests named like sha256sum output, such as .sha256 or .sha256sum, hold digests of the algorithm their extension names
+    if IsDatabaseManifest(ManifestFilePath):
+        return None
+    Extension = os.path.splitext(ManifestFilePath)[1].lower().lstrip(".")
+    Extension = Extension[:-3] if Extension.endswith("sum") else Extension
+    return ResolveAlgorithm(Extension)
+
+
+def IsFileUnchanged(File, PreviousFileEntry, PreviousCreatedNS):
+    # Files modified within a few seconds of the previous scan may have changed again without their mtime changing
+    if PreviousFileEntry is None or PreviousCreatedNS is None:
+        return False
+    if File.Stat.st_mtime_ns > PreviousCreatedNS - 2000000000:
+        return False
+    return (File.Stat.st_size, File.Stat.st_mtime_ns, File.Stat.st_ino) == (PreviousFileEntry["Size"], PreviousFileEntry["MTimeNS"], PreviousFileEntry["Inode"])
+
+
+def CreateManifest(Input, Algorithm=None, Settings=None, PreviousManifest=None, IgnoreSingleFileNames=True):
+    # Validate Input
+    if not os.path.exists(Input):
+        print("Input does not exist.")
+        return None
+
+    # Determine Algorithm
+    Algorithm = DetermineAlgorithm(Algorithm)
+    if Algorithm is None:
+        return None
+
+    # Scan Input
+    CreatedNS = time.time_ns()
+    Settings = Settings if Settings is not None else HashSettings()
+    InputScanInst = ScanInput(Input, CancellationTokenInst=Settings.CancellationTokenInst, MetricsInst=Settings.MetricsInst)
+
+    # Reuse Digests of Files Unchanged Since the Previous Manifest
+    ReusedDigests = {}
+    if PreviousManifest is not None:
+        for File in InputScanInst.Files:
+            PreviousFileEntry = PreviousManifest["Files"].get(File.ManifestPath)
+            if IsFileUnchanged(File, PreviousFileEntry, PreviousManifest["CreatedNS"]):
+                ReusedDigests[File.ManifestPath] = PreviousFileEntry["Digest"]
+    ChangedScan = InputScan(Input, InputScanInst.InputDirectory, [File for File in InputScanInst.Files if File.ManifestPath not in ReusedDigests])
+
+    # Open Digest Cache
+    DigestCacheInst = DigestCache(Settings.DigestCachePath, MaxEntries=Settings.DigestCacheMaxEntries) if Settings.DigestCachePath is not None else None
+
+    # Create Progress Reporter
+    ProgressReporterInst = CreateProgressReporter(Settings, [ChangedScan])
+
+    # Hash Changed Files in Thread
+    InputThread = HashThread("HashThreadOne", ChangedScan, queue.Queue(), Algorithm, Settings=Settings, DigestCacheInst=DigestCacheInst, ProgressReporterInst=ProgressReporterInst, InputIndex=0)
+    InputThread.start()
+    InputThread.join()
+
+    # Close Digest Cache, Keeping Digests Stored Before Any Cancellation
+    if DigestCacheInst is not None:
+        DigestCacheInst.Close()
+    CheckCancellation(Settings.CancellationTokenInst)
+    RaiseHashThreadErrors([InputThread])
+
+    # Finish Progress
+    if ProgressReporterInst is not None:
+        ProgressReporterInst.Finish()
+
+    # Record File Stats with Digests
+    Files = {}
+    for File in InputScanInst.Files:
+        FileDigest = ReusedDigests[File.ManifestPath] if File.ManifestPath in ReusedDigests else InputThread.Manifest[File.ManifestPath]["Digest"]
+        Files[File.ManifestPath] = {"Size": File.Stat.st_size, "MTimeNS": File.Stat.st_mtime_ns, "Inode": File.Stat.st_ino, "Digest": FileDigest}
+
+    # Combine File Digests as the Hash Method Would
+    Digest = CombineFileDigests(Algorithm, [bytes.fromhex(Files[File.ManifestPath]["Digest"]) for File in InputScanInst.Files], InputScanInst.FilePaths, IgnoreSingleFileNames=IgnoreSingleFileNames)
+
+    return {"Algorithm": Algorithm, "Input": os.path.abspath(Input), "CreatedNS": CreatedNS, "Digest": Digest.hex(), "Rehashed": len(ChangedScan.Files), "Files": Files}
+
+
+def ExportManifest(Input, ManifestFilePath, Algorithm=None, Settings=None):
+    # Determine Algorithm from the Manifest File's Extension
+    ExtensionAlgorithm = GetExtensionAlgorithm(ManifestFilePath)
+    if ExtensionAlgorithm is not None:
+        if Algorithm is None:
+            Algorithm = ExtensionAlgorithm
+        elif ResolveAlgorithm(Algorithm) not in (None, ExtensionAlgorithm):
+            print(f"The manifest file's extension is for {ExtensionAlgorithm} digests, not {Algorithm}.")
+            return None
+
+    Manifest = CreateManifest(Input, Algorithm=Algorithm, Settings=Settings)
+    if Manifest is None:
+        return None
+    SaveManifest(Manifest, ManifestFilePath)
+    return Manifest
+
+
+def CompareInputToManifest(Input, ManifestFilePath, Algorithm=None, IgnoreSingleFileNames=True, Settings=None):
+    # Load Saved Manifest
+    if not os.path.isfile(ManifestFilePath):
+        print("Manifest file does not exist.")
+        return None
+    SavedManifest = LoadManifest(ManifestFilePath, Algorithm=Algorithm)
+    if SavedManifest is None:
+        return None
+
+    # Hash Input with the Manifest's Algorithm
+    CurrentManifest = CreateManifest(Input, Algorithm=SavedManifest["Algorithm"], Settings=Settings)
+    if CurrentManifest is None:
+        return None
+
+    return CompareManifestDigests(SavedManifest, CurrentManifest, IgnoreSingleFileNames=IgnoreSingleFileNames)
+
+
+def UpdateManifest(Input, ManifestFilePath, Algorithm=None, IgnoreSingleFileNames=True, Settings=None):
+    # Load Saved Manifest
+    if not os.path.isfile(ManifestFilePath):
+        print("Manifest file does not exist.")
+        return None
+    SavedManifest = LoadManifest(ManifestFilePath, Algorithm=Algorithm)
+    if SavedManifest is None:
+        return None
+
+    # Rehash Only Files Whose Size, Modification Time, or Inode Changed
+    CurrentManifest = CreateManifest(Input, Algorithm=SavedManifest["Algorithm"], Settings=Settings, PreviousManifest=SavedManifest, IgnoreSingleFileNames=IgnoreSingleFileNames)
+    if CurrentManifest is None:
+        return None
+
+    # Save Updated Manifest
+    SaveManifest(CurrentManifest, ManifestFilePath)
+
+    Result = CompareManifestDigests(SavedManifest, CurrentManifest, IgnoreSingleFileNames=IgnoreSingleFileNames)
+    Result.update({"Digest": CurrentManifest["Digest"], "Rehashed": CurrentManifest["Rehashed"], "Reused": len(CurrentManifest["Files"]) - CurrentManifest["Rehashed"]})
+    return Result
+
+
+def CompareManifestDigests(SavedManifest, CurrentManifest, IgnoreSingleFileNames=True):
+    # Only digests are compared (text manifests record no sizes, and a size change always changes the digest)
+    SavedDigests = {ManifestPath: FileEntry["Digest"] for ManifestPath, FileEntry in SavedManifest["Files"].items()}
+    CurrentDigests = {ManifestPath: FileEntry["Digest"] for ManifestPath, FileEntry in CurrentManifest["Files"].items()}
+    if IgnoreSingleFileNames and os.path.isfile(CurrentManifest["Input"]) and len(SavedDigests) == 1:
+        CurrentDigests = {ManifestPath: FileDigest for ManifestPath, FileDigest in zip(SavedDigests.keys(), CurrentDigests.values())}
+    return CompareManifests(SavedDigests, CurrentDigests)
+
+
+# Saving and Loading (sqlite3 is imported by the database functions only, keeping it out of the command line's startup)
+def SaveManifest(Manifest, ManifestFilePath):
+    ManifestDirectory = os.path.dirname(os.path.abspath(ManifestFilePath))
+    if not os.path.isdir(ManifestDirectory):
+        os.makedirs(ManifestDirectory)
+    if IsDatabaseManifest(ManifestFilePath):
+        SaveDatabaseManifest(Manifest, ManifestFilePath)
+    else:
+        SaveTextManifest(Manifest, ManifestFilePath)
+
+
+def LoadManifest(ManifestFilePath, Algorithm=None):
+    if IsDatabaseManifest(ManifestFilePath):
+        return LoadDatabaseManifest(ManifestFilePath)
+    return LoadTextManifest(ManifestFilePath, Algorithm=Algorithm)
+
+
+def SaveTextManifest(Manifest, ManifestFilePath):
+    # Lines match sha256sum and md5sum output, including their escaping of backslashes and newlines in names, so "sha256sum -c" can check them from the input directory
+    with open(ManifestFilePath, "w", encoding="utf-8", errors="surrogateescape", newline="\n") as ManifestFile:
+        ManifestFile.write(f"{TextManifestAlgorithmPrefix}{Manifest['Algorithm']}\n")
+        for ManifestPath, FileEntry in sorted(Manifest["Files"].items()):
+            if "\\" in ManifestPath or "\n" in ManifestPath or "\r" in ManifestPath:
+                EscapedPath = ManifestPath.replace("\\", "\\\\").replace("\n", "\\n").replace("\r", "\\r")
+                ManifestFile.write(f"\\{FileEntry['Digest']}  {EscapedPath}\n")
+            else:
+                ManifestFile.write(f"{FileEntry['Digest']}  {ManifestPath}\n")
+
+
+def LoadTextManifest(ManifestFilePath, Algorithm=None):
+    Files = {}
+    RecordedAlgorithm = None
+    with open(ManifestFilePath, "r", encoding="utf-8", errors="surrogateescape", newline="\n") as ManifestFile:
+        for Line in ManifestFile:
+            Line = Line.rstrip("\n")
+            if Line.startswith(TextManifestAlgorithmPrefix):
+                RecordedAlgorithm = Line[len(TextManifestAlgorithmPrefix):].strip()
+                continue
+            if Line == "" or Line.startswith("#"):
+                continue
+            Escaped = Line.startswith("\\")
+            if Escaped:
+                Line = Line[1:]
+            FileDigest, Separator, ManifestPath = Line.partition(" ")
+            if Separator == "" or ManifestPath[:1] not in (" ", "*"):
+                print(f"Manifest line is not in sha256sum format:  {Line}")
+                return None
+            ManifestPath = ManifestPath[1:]
+            if Escaped:
+                ManifestPath = ManifestPath.replace("\\\\", "\0").replace("\\n", "\n").replace("\\r", "\r").replace("\0", "\\")
+            Files[ManifestPath] = {"Size": None, "MTimeNS": None, "Inode": None, "Digest": FileDigest.lower()}
+
+    # Determine Algorithm
+    if Algorithm is None:
+        Algorithm = RecordedAlgorithm
+    if Algorithm is None and Files:
+        DigestLength = len(next(iter(Files.values()))["Digest"])
+        ExtensionAlgorithm = GetExtensionAlgorithm(ManifestFilePath)
+        if ExtensionAlgorithm is not None and len(NewHashObject(ExtensionAlgorithm).digest()) * 2 == DigestLength:
+            Algorithm = ExtensionAlgorithm
+        else:
+            Algorithm = TextManifestDigestLengths.get(DigestLength)
+        if Algorithm is None:
+            print("Could not determine the manifest's algorithm.")
+            return None
+    Algorithm = DetermineAlgorithm(Algorithm)
+    if Algorithm is None:
+        return None
+
+    return {"Algorithm": Algorithm, "Input": None, "CreatedNS": None, "Files": Files}
+
+
+def SaveDatabaseManifest(Manifest, ManifestFilePath):
+    # Digests are stored as blobs in a table without row IDs, keeping manifests of millions of files compact and indexed by path; paths are stored as the bytes the filesystem uses, so names that are not valid UTF-8 are kept exactly
+    import sqlite3
+    if os.path.exists(ManifestFilePath):
+        os.remove(ManifestFilePath)
+    Connection = sqlite3.connect(ManifestFilePath)
+    try:
+        Connection.execute("CREATE TABLE Info (Key TEXT PRIMARY KEY, Value TEXT)")
+        Connection.execute("CREATE TABLE Files (Path BLOB PRIMARY KEY, Size INTEGER NOT NULL, MTimeNS INTEGER NOT NULL, Inode INTEGER NOT NULL, Digest BLOB NOT NULL) WITHOUT ROWID")
+        Connection.executemany("INSERT INTO Info VALUES (?, ?)", [("Algorithm", Manifest["Algorithm"]), ("Input", os.fsencode(Manifest["Input"])), ("CreatedNS", str(Manifest.get("CreatedNS") or time.time_ns()))])
+        Connection.executemany("INSERT INTO Files VALUES (?, ?, ?, ?, ?)", ((os.fsencode(ManifestPath), FileEntry["Size"], FileEntry["MTimeNS"], FileEntry["Inode"], bytes.fromhex(FileEntry["Digest"])) for ManifestPath, FileEntry in Manifest["Files"].items()))
+        Connection.commit()
+    finally:
+        Connection.close()
+
+
+def LoadDatabaseManifest(ManifestFilePath):
+    import sqlite3
+    Connection = sqlite3.connect(ManifestFilePath)
+    try:
+        Info = dict(Connection.execute("SELECT Key, Value FROM Info").fetchall())
+        Files = {os.fsdecode(ManifestPath): {"Size": Size, "MTimeNS": MTimeNS, "Inode": Inode, "Digest": FileDigest.hex()} for ManifestPath, Size, MTimeNS, Inode, FileDigest in Connection.execute("SELECT Path, Size, MTimeNS, Inode, Digest FROM Files")}
+    except sqlite3.DatabaseError:
+        print("Manifest file is not a valid manifest database.")
+        return None
+    finally:
+        Connection.close()
+    Algorithm = DetermineAlgorithm(Info.get("Algorithm"))
+    if Algorithm is None:
+        return None
+    return {"Algorithm": Algorithm, "Input": os.fsdecode(Info["Input"]) if Info.get("Input") is not None else None, "CreatedNS": int(Info["CreatedNS"]) if "CreatedNS" in Info else None, "Files": Files}
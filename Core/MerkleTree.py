@@ -0,0 +1,174 @@
+import collections
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from Core.CancellationToken import CheckCancellation
+from Core.HashBackends import NewHashObject
+from Core.PageCache import ReleaseReadRange
+from Core.RateLimiter import LimitRate
+
+# Node Prefixes (leaves and interior nodes are hashed with different prefixes so one can never pass for the other)
+LeafPrefix = b"\x00"
+InteriorPrefix = b"\x01"
+
+
+def HashLeaf(Algorithm, Block):
+    HashObject = NewHashObject(Algorithm)
+    HashObject.update(LeafPrefix)
+    HashObject.update(Block)
+    return HashObject.digest()
+
+
+def HashInterior(Algorithm, LeftDigest, RightDigest):
+    HashObject = NewHashObject(Algorithm)
+    HashObject.update(InteriorPrefix)
+    HashObject.update(LeftDigest)
+    HashObject.update(RightDigest)
+    return HashObject.digest()
+
+
+def GetBlockCount(FileSize, BlockSize):
+    return max(1, -(-FileSize // BlockSize))
+
+
+def BuildLevels(Algorithm, Leaves):
+    # Pairs are hashed level by level; an unpaired last node is promoted unchanged, so node i on level L always covers blocks i * 2 ** L up to (i + 1) * 2 ** L
+    Levels = [Leaves]
+    while len(Levels[-1]) > 1:
+        PreviousLevel = Levels[-1]
+        Levels.append([HashInterior(Algorithm, PreviousLevel[Index], PreviousLevel[Index + 1]) if Index + 1 < len(PreviousLevel) else PreviousLevel[Index] for Index in range(0, len(PreviousLevel), 2)])
+    return Levels
+
+
+def HashBlock(FileDescriptor, Algorithm, BlockIndex, BlockSize, CancellationTokenInst=None, RateLimiterInst=None, ReadMode="Buffered"):
+    # os.pread does not move a shared file position, so workers can read blocks of one descriptor concurrently
+    CheckCancellation(CancellationTokenInst)
+    LimitRate(RateLimiterInst, ByteCount=BlockSize, CancellationTokenInst=CancellationTokenInst)
+    Block = os.pread(FileDescriptor, BlockSize, BlockIndex * BlockSize)
+    ReleaseReadRange(ReadMode, FileDescriptor, BlockIndex * BlockSize, len(Block))
+    return HashLeaf(Algorithm, Block), len(Block)
+
+
+def HashBlocks(Path, Algorithm, BlockSize, BlockIndices, Workers=1, ReportBytes=None, CancellationTokenInst=None, RateLimiterInst=None, ReadMode="Buffered", MetricsInst=None):
+    # Hash the given blocks of a file, with at most a few blocks per worker in memory at once
+    Leaves = {}
+    LimitRate(RateLimiterInst, FileCount=1, CancellationTokenInst=CancellationTokenInst)
+    FileDescriptor = os.open(Path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        def AddLeaf(BlockIndex, LeafResult):
+            Leaves[BlockIndex], BlockLength = LeafResult
+            if ReportBytes is not None:
+                ReportBytes(BlockLength)
+            if MetricsInst is not None:
+                MetricsInst.AddCount("Bytes", BlockLength)
+
+        if Workers == 1:
+            for BlockIndex in BlockIndices:
+                AddLeaf(BlockIndex, HashBlock(FileDescriptor, Algorithm, BlockIndex, BlockSize, CancellationTokenInst, RateLimiterInst, ReadMode))
+        else:
+            with ThreadPoolExecutor(max_workers=Workers, thread_name_prefix="MerkleWorker") as Executor:
+                PendingBlocks = collections.deque()
+                for BlockIndex in BlockIndices:
+                    PendingBlocks.append((BlockIndex, Executor.submit(HashBlock, FileDescriptor, Algorithm, BlockIndex, BlockSize, CancellationTokenInst, RateLimiterInst, ReadMode)))
+                    if len(PendingBlocks) >= Workers * 2:
+                        PendingBlockIndex, PendingFuture = PendingBlocks.popleft()
+                        AddLeaf(PendingBlockIndex, PendingFuture.result())
+                while PendingBlocks:
+                    PendingBlockIndex, PendingFuture = PendingBlocks.popleft()
+                    AddLeaf(PendingBlockIndex, PendingFuture.result())
+    finally:
+        os.close(FileDescriptor)
+    if MetricsInst is not None:
+        MetricsInst.AddCount("Files")
+    return Leaves
+
+
+def BuildMerkleTree(Path, Algorithm, BlockSize, Workers=1, ReportBytes=None, CancellationTokenInst=None, RateLimiterInst=None, ReadMode="Buffered", MetricsInst=None):
+    FileStat = os.stat(Path)
+    BlockCount = GetBlockCount(FileStat.st_size, BlockSize)
+    Leaves = HashBlocks(Path, Algorithm, BlockSize, range(BlockCount), Workers=Workers, ReportBytes=ReportBytes, CancellationTokenInst=CancellationTokenInst, RateLimiterInst=RateLimiterInst, ReadMode=ReadMode, MetricsInst=MetricsInst)
+    return {"Algorithm": Algorithm, "BlockSize": BlockSize, "Size": FileStat.st_size, "MTimeNS": FileStat.st_mtime_ns, "Levels": BuildLevels(Algorithm, [Leaves[BlockIndex] for BlockIndex in range(BlockCount)])}
+
+
+def GetMerkleRoot(MerkleTree):
+    return MerkleTree["Levels"][-1][0]
+
+
+def FindMismatchedRanges(MerkleTreeOne, MerkleTreeTwo):
+    # Descend from the root into differing subtrees only, so identical regions are skipped a whole subtree at a time
+    BlockSize = MerkleTreeOne["BlockSize"]
+    LargerSize = max(MerkleTreeOne["Size"], MerkleTreeTwo["Size"])
+    LargerBlockCount = max(len(MerkleTreeOne["Levels"][0]), len(MerkleTreeTwo["Levels"][0]))
+
+    def GetNode(MerkleTree, Level, Index):
+        Levels = MerkleTree["Levels"]
+        return Levels[Level][Index] if Level < len(Levels) and Index < len(Levels[Level]) else None
+
+    MismatchedBlocks = []
+    PendingNodes = [(max(len(MerkleTreeOne["Levels"]), len(MerkleTreeTwo["Levels"])) - 1, 0)]
+    while PendingNodes:
+        Level, Index = PendingNodes.pop()
+        NodeOne = GetNode(MerkleTreeOne, Level, Index)
+        if NodeOne is not None and NodeOne == GetNode(MerkleTreeTwo, Level, Index):
+            continue
+        if Level == 0:
+            MismatchedBlocks.append(Index)
+        else:
+            for ChildIndex in (Index * 2 + 1, Index * 2):
+                if ChildIndex * (2 ** (Level - 1)) < LargerBlockCount:
+                    PendingNodes.append((Level - 1, ChildIndex))
+
+    # Merge Adjacent Blocks into Byte Ranges
+    MismatchedRanges = []
+    for BlockIndex in sorted(MismatchedBlocks):
+        Start = BlockIndex * BlockSize
+        End = min(LargerSize, Start + BlockSize)
+        if MismatchedRanges and MismatchedRanges[-1][1] == Start:
+            MismatchedRanges[-1][1] = End
+        else:
+            MismatchedRanges.append([Start, End])
+    return MismatchedRanges
+
+
+# Storage (digests are stored as hex so trees can be saved as JSON)
+def SaveMerkleTree(MerkleTree, TreePath):
+    StoredTree = dict(MerkleTree)
+    StoredTree["Levels"] = [[Digest.hex() for Digest in Level] for Level in MerkleTree["Levels"]]
+    with open(TreePath, "w") as TreeFile:
+        TreeFile.write(json.dumps(StoredTree))
+
+
+def LoadMerkleTree(TreePath):
+    with open(TreePath, "r") as TreeFile:
+        MerkleTree = json.loads(TreeFile.read())
+    MerkleTree["Levels"] = [[bytes.fromhex(Digest) for Digest in Level] for Level in MerkleTree["Levels"]]
+    return MerkleTree
+
+
+def GetStoredMerkleTreePath(TreeDirectory, Path, Algorithm, BlockSize):
+    TreeName = hashlib.sha256(bytes(f"{os.path.abspath(Path)}\n{Algorithm}\n{BlockSize}", "utf-8", "surrogateescape")).hexdigest()
+    return os.path.join(TreeDirectory, TreeName + ".json")
+
+
+def GetMerkleTree(Path, Algorithm, BlockSize, Workers=1, ReportBytes=None, TreeDirectory=None, CancellationTokenInst=None, RateLimiterInst=None, ReadMode="Buffered", MetricsInst=None):
+    # Reuse a stored tree while the file's size and modification time are unchanged, and rebuild it otherwise (nothing records which regions of a modified file changed, so every block has to be read again)
+    if TreeDirectory is None:
+        return BuildMerkleTree(Path, Algorithm, BlockSize, Workers=Workers, ReportBytes=ReportBytes, CancellationTokenInst=CancellationTokenInst, RateLimiterInst=RateLimiterInst, ReadMode=ReadMode, MetricsInst=MetricsInst)
+    TreePath = GetStoredMerkleTreePath(TreeDirectory, Path, Algorithm, BlockSize)
+    MerkleTree = None
+    if os.path.isfile(TreePath):
+        try:
+            MerkleTree = LoadMerkleTree(TreePath)
+        except (OSError, ValueError, KeyError):
+            MerkleTree = None
+        FileStat = os.stat(Path)
+        if MerkleTree is not None and MerkleTree["Size"] == FileStat.st_size and MerkleTree["MTimeNS"] == FileStat.st_mtime_ns:
+            if ReportBytes is not None:
+                ReportBytes(FileStat.st_size)
+            return MerkleTree
+    MerkleTree = BuildMerkleTree(Path, Algorithm, BlockSize, Workers=Workers, ReportBytes=ReportBytes, CancellationTokenInst=CancellationTokenInst, RateLimiterInst=RateLimiterInst, ReadMode=ReadMode, MetricsInst=MetricsInst)
+    os.makedirs(TreeDirectory, exist_ok=True)
+    SaveMerkleTree(MerkleTree, TreePath)
+    return MerkleTree
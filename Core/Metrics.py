@@ -0,0 +1,200 @@
+import bisect
+import heapq
+import json
+import os
+import threading
+import time
+
+# Open Latency Histogram Bucket Upper Bounds, in Seconds (cumulative, as Prometheus expects)
+OpenLatencyBuckets = [0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0]
+
+
+class FileTimer:
+    __slots__ = ("StartTime", "StartCPUTime", "OpenSeconds", "ReadSeconds")
+
+    def __init__(self):
+        self.StartTime = time.perf_counter()
+        self.StartCPUTime = time.thread_time()
+        self.OpenSeconds = 0.0
+        self.ReadSeconds = 0.0
+
+
+class ComparisonMetrics:
+    def __init__(self, Profile=False, SlowestFileCount=10):
+        # Variables
+        self.Lock = threading.Lock()
+        self.StartTime = time.perf_counter()
+        self.StartCPUTime = time.process_time()
+        self.EndTime = None
+        self.EndCPUTime = None
+        self.Stages = {}
+        self.Counters = {"Files": 0, "Bytes": 0, "CacheHits": 0, "Directories": 0}
+        self.OpenLatencyCounts = [0] * (len(OpenLatencyBuckets) + 1)
+        self.OpenLatencySum = 0.0
+        self.SlowestFiles = []
+        self.Profiles = []
+
+        # Store Parameters
+        self.Profile = Profile
+        self.SlowestFileCount = SlowestFileCount
+
+    def AddStageTime(self, Stage, WallSeconds, CPUSeconds=None):
+        with self.Lock:
+            self.AddStageTimeLocked(Stage, WallSeconds, CPUSeconds)
+
+    def AddStageTimeLocked(self, Stage, WallSeconds, CPUSeconds=None):
+        # Stage times are summed over threads, so stages running in parallel can add up to more than the wall time
+        StageTimes = self.Stages.setdefault(Stage, {"WallSeconds": 0.0, "CPUSeconds": None, "Calls": 0})
+        StageTimes["WallSeconds"] += WallSeconds
+        StageTimes["Calls"] += 1
+        if CPUSeconds is not None:
+            StageTimes["CPUSeconds"] = (StageTimes["CPUSeconds"] or 0.0) + CPUSeconds
+
+    def AddCount(self, Counter, Count=1):
+        with self.Lock:
+            self.Counters[Counter] += Count
+
+    def RecordFile(self, File, FileTimerInst):
+        WallSeconds = time.perf_counter() - FileTimerInst.StartTime
+        CPUSeconds = time.thread_time() - FileTimerInst.StartCPUTime
+
+        # Time not spent opening or reading a file is spent hashing it (including page faults for memory-mapped files); CPU time covers the whole file
+        with self.Lock:
+            self.AddStageTimeLocked("Open", FileTimerInst.OpenSeconds)
+            self.AddStageTimeLocked("Read", FileTimerInst.ReadSeconds)
+            self.AddStageTimeLocked("Digest", max(0.0, WallSeconds - FileTimerInst.OpenSeconds - FileTimerInst.ReadSeconds), CPUSeconds)
+            self.Counters["Files"] += 1
+            self.Counters["Bytes"] += File.Stat.st_size
+            self.OpenLatencyCounts[bisect.bisect_left(OpenLatencyBuckets, FileTimerInst.OpenSeconds)] += 1
+            self.OpenLatencySum += FileTimerInst.OpenSeconds
+            SlowFile = (WallSeconds, File.Path, File.Stat.st_size)
+            if len(self.SlowestFiles) < self.SlowestFileCount:
+                heapq.heappush(self.SlowestFiles, SlowFile)
+            elif SlowFile > self.SlowestFiles[0]:
+                heapq.heapreplace(self.SlowestFiles, SlowFile)
+
+    def AddProfile(self, Profiler):
+        with self.Lock:
+            self.Profiles.append(Profiler)
+
+    def Finish(self):
+        self.EndTime = time.perf_counter()
+        self.EndCPUTime = time.process_time()
+
+    def ToDict(self):
+        with self.Lock:
+            WallSeconds = (self.EndTime if self.EndTime is not None else time.perf_counter()) - self.StartTime
+            CPUSeconds = (self.EndCPUTime if self.EndCPUTime is not None else time.process_time()) - self.StartCPUTime
+            CumulativeCounts = [sum(self.OpenLatencyCounts[:Index + 1]) for Index in range(len(OpenLatencyBuckets))]
+            return {
+                "WallSeconds": WallSeconds,
+                "CPUSeconds": CPUSeconds,
+                "Stages": {Stage: dict(StageTimes) for Stage, StageTimes in self.Stages.items()},
+                **self.Counters,
+                "BytesPerSecond": self.Counters["Bytes"] / WallSeconds if WallSeconds > 0 else 0.0,
+                "FilesPerSecond": self.Counters["Files"] / WallSeconds if WallSeconds > 0 else 0.0,
+                "OpenLatency": {"Buckets": {str(UpperBound): Count for UpperBound, Count in zip(OpenLatencyBuckets, CumulativeCounts)}, "Count": sum(self.OpenLatencyCounts), "SumSeconds": self.OpenLatencySum},
+                "SlowestFiles": [{"Path": Path, "Size": Size, "Seconds": Seconds} for Seconds, Path, Size in sorted(self.SlowestFiles, reverse=True)]
+            }
+
+    def ToPrometheus(self):
+        # Text exposition format, for the node exporter's textfile collector
+        MetricsDict = self.ToDict()
+        Lines = []
+
+        def AddMetric(Name, MetricType, Help, Samples):
+            Lines.append(f"# HELP comparator_{Name} {Help}")
+            Lines.append(f"# TYPE comparator_{Name} {MetricType}")
+            for Suffix, Labels, Value in Samples:
+                LabelText = "{" + ",".join(f"{Label}=\"{EscapeLabelValue(LabelValue)}\"" for Label, LabelValue in Labels.items()) + "}" if Labels else ""
+                Lines.append(f"comparator_{Name}{Suffix}{LabelText} {Value!r}")
+
+        AddMetric("wall_seconds", "gauge", "Wall time of the comparison.", [("", {}, MetricsDict["WallSeconds"])])
+        AddMetric("cpu_seconds", "gauge", "CPU time of the process during the comparison.", [("", {}, MetricsDict["CPUSeconds"])])
+        AddMetric("stage_wall_seconds", "gauge", "Wall time per stage, summed over threads.", [("", {"stage": Stage}, StageTimes["WallSeconds"]) for Stage, StageTimes in MetricsDict["Stages"].items()])
+        AddMetric("stage_cpu_seconds", "gauge", "CPU time per stage, summed over threads.", [("", {"stage": Stage}, StageTimes["CPUSeconds"]) for Stage, StageTimes in MetricsDict["Stages"].items() if StageTimes["CPUSeconds"] is not None])
+        for Counter, Help in {"Files": "Files hashed or compared.", "Bytes": "Bytes read to hash or compare files.", "CacheHits": "Files whose digests came from the digest cache.", "Directories": "Directories scanned."}.items():
+            AddMetric(f"{SnakeCase(Counter)}_total", "counter", Help, [("", {}, MetricsDict[Counter])])
+        AddMetric("bytes_per_second", "gauge", "Bytes read per second of wall time.", [("", {}, MetricsDict["BytesPerSecond"])])
+        AddMetric("files_per_second", "gauge", "Files hashed or compared per second of wall time.", [("", {}, MetricsDict["FilesPerSecond"])])
+        AddMetric("open_seconds", "histogram", "Latency of opening files for hashing.", [("_bucket", {"le": UpperBound}, Count) for UpperBound, Count in MetricsDict["OpenLatency"]["Buckets"].items()] + [("_bucket", {"le": "+Inf"}, MetricsDict["OpenLatency"]["Count"]), ("_sum", {}, MetricsDict["OpenLatency"]["SumSeconds"]), ("_count", {}, MetricsDict["OpenLatency"]["Count"])])
+        AddMetric("slowest_file_seconds", "gauge", "Wall time of the slowest files to hash.", [("", {"path": SlowFile["Path"]}, SlowFile["Seconds"]) for SlowFile in MetricsDict["SlowestFiles"]])
+        return "\n".join(Lines) + "\n"
+
+
+def EscapeLabelValue(Value):
+    return str(Value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def SnakeCase(Name):
+    return "".join(f"_{Character.lower()}" if Character.isupper() and Index > 0 else Character.lower() for Index, Character in enumerate(Name))
+
+
+class MeasureStage:
+    # Adds the wall and CPU time of a block to a stage; does nothing without metrics
+    def __init__(self, MetricsInst, Stage):
+        self.MetricsInst = MetricsInst
+        self.Stage = Stage
+
+    def __enter__(self):
+        if self.MetricsInst is not None:
+            self.StartTime = time.perf_counter()
+            self.StartCPUTime = time.thread_time()
+
+    def __exit__(self, ExceptionType, ExceptionValue, Traceback):
+        if self.MetricsInst is not None:
+            self.MetricsInst.AddStageTime(self.Stage, time.perf_counter() - self.StartTime, time.thread_time() - self.StartCPUTime)
+
+
+class ProfileThread:
+    # A profiler only sees the thread it runs in, so each reading thread is profiled separately and the profiles are merged when saved
+    def __init__(self, MetricsInst):
+        self.Profiler = None
+        self.MetricsInst = MetricsInst
+        if MetricsInst is not None and MetricsInst.Profile:
+            # Imported only when profiling, as cProfile and pstats would slow every start of the command line
+            import cProfile
+            self.Profiler = cProfile.Profile()
+
+    def __enter__(self):
+        if self.Profiler is not None:
+            self.Profiler.enable()
+
+    def __exit__(self, ExceptionType, ExceptionValue, Traceback):
+        if self.Profiler is not None:
+            self.Profiler.disable()
+            self.MetricsInst.AddProfile(self.Profiler)
+
+
+def TimeCall(FileTimerInst, Stage, Function, *Arguments, **KeywordArguments):
+    # Times one open or read call of a file; without a timer, the call is made directly
+    if FileTimerInst is None:
+        return Function(*Arguments, **KeywordArguments)
+    StartTime = time.perf_counter()
+    try:
+        return Function(*Arguments, **KeywordArguments)
+    finally:
+        if Stage == "Open":
+            FileTimerInst.OpenSeconds += time.perf_counter() - StartTime
+        else:
+            FileTimerInst.ReadSeconds += time.perf_counter() - StartTime
+
+
+def SaveMetrics(MetricsInst, MetricsPath):
+    # Files ending in .prom are written in Prometheus text format, others as JSON; the file is replaced atomically so collectors never read it half-written
+    TemporaryPath = f"{MetricsPath}.tmp"
+    with open(TemporaryPath, "w") as MetricsFile:
+        MetricsFile.write(MetricsInst.ToPrometheus() if MetricsPath.endswith(".prom") else json.dumps(MetricsInst.ToDict(), indent=2))
+    os.replace(TemporaryPath, MetricsPath)
+
+
+def SaveProfile(MetricsInst, ProfilePath):
+    # Saved in the pstats format, readable with python -m pstats or snakeviz
+    if not MetricsInst.Profiles:
+        return False
+    import pstats
+    Statistics = pstats.Stats(MetricsInst.Profiles[0])
+    for Profiler in MetricsInst.Profiles[1:]:
+        Statistics.add(Profiler)
+    Statistics.dump_stats(ProfilePath)
+    return True
@@ -0,0 +1,52 @@
+import mmap
+import os
+
+# Read Modes (buffered reads go through the page cache as before; streaming reads drop pages behind the reader; direct reads bypass the cache)
+ReadModes = ["Buffered", "Streaming", "Direct"]
+
+# Direct reads need buffers, offsets, and lengths aligned to the device's logical block size; a page covers every common block size
+DirectReadAlignment = mmap.PAGESIZE
+
+
+def AdviseSequentialRead(ReadMode, FileDescriptor):
+    if ReadMode != "Buffered" and hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(FileDescriptor, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+
+
+def ReleaseReadRange(ReadMode, FileDescriptor, Offset, Length):
+    # Pages already hashed are dropped from the page cache, so hashing a large input does not evict other applications' working sets
+    if ReadMode != "Buffered" and hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(FileDescriptor, Offset, Length, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+
+
+def OpenDirect(Path):
+    # Returns None where O_DIRECT is unsupported (including tmpfs and some network filesystems), so callers can fall back to streaming reads
+    if not hasattr(os, "O_DIRECT"):
+        return None
+    try:
+        return os.open(Path, os.O_RDONLY | os.O_DIRECT)
+    except OSError:
+        return None
+
+
+def GetAlignedBuffer(Size):
+    # Anonymous memory maps are page-aligned, as direct reads require
+    return mmap.mmap(-1, -(-Size // DirectReadAlignment) * DirectReadAlignment)
+
+
+def GetPageCacheSize():
+    # Size of the Linux page cache in bytes, or None where it cannot be read
+    try:
+        with open("/proc/meminfo", "r") as MemoryInfoFile:
+            for Line in MemoryInfoFile:
+                if Line.startswith("Cached:"):
+                    return int(Line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
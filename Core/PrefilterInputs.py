@@ -0,0 +1,46 @@
+import os
+
+from Core.CancellationToken import CheckCancellation
+from Core.HashSettings import HashSettings
+from Core.RateLimiter import LimitRate
+
+
+def PrefilterInputs(InputOneScan, InputTwoScan, IgnoreSingleFileNames=True, Settings=None):
+    Settings = Settings if Settings is not None else HashSettings()
+
+    def Rejection(Stage, Reason):
+        return {"Stage": Stage, "Reason": Reason}
+
+    # Stage One:  File Counts, Paths, and Sizes
+    if len(InputOneScan.Files) != len(InputTwoScan.Files):
+        return Rejection("Sizes", f"The inputs contain different numbers of files ({len(InputOneScan.Files)} and {len(InputTwoScan.Files)}).")
+    for FileOne, FileTwo in zip(InputOneScan.Files, InputTwoScan.Files):
+        if not IgnoreSingleFileNames and FileOne.RelativePath != FileTwo.RelativePath:
+            return Rejection("Sizes", f"{min(FileOne.RelativePath, FileTwo.RelativePath)} is only present in one input.")
+        if FileOne.Stat.st_size != FileTwo.Stat.st_size:
+            return Rejection("Sizes", f"{FileOne.RelativePath} differs in size ({FileOne.Stat.st_size} and {FileTwo.Stat.st_size} bytes).")
+
+    # Stage Two:  Head, Middle, and Tail Samples of Larger Files (archive members cannot be sampled without decompressing them, so archives skip this stage)
+    if Settings.UsePrefilterSamples and InputOneScan.ArchiveType is None and InputTwoScan.ArchiveType is None:
+        for FileOne, FileTwo in zip(InputOneScan.Files, InputTwoScan.Files):
+            if FileOne.Stat.st_size < Settings.PrefilterSampleMinimumFileSize:
+                continue
+            CheckCancellation(Settings.CancellationTokenInst)
+
+            # Each pair of files is opened once for all three samples, which are read with os.pread
+            LimitRate(Settings.RateLimiterInst, FileCount=2, CancellationTokenInst=Settings.CancellationTokenInst)
+            with open(FileOne.Path, "rb", buffering=0) as OpenedFileOne, open(FileTwo.Path, "rb", buffering=0) as OpenedFileTwo:
+                for SampleName, SampleOffset in GetSampleOffsets(FileOne.Stat.st_size, Settings.PrefilterSampleSize).items():
+                    LimitRate(Settings.RateLimiterInst, ByteCount=Settings.PrefilterSampleSize * 2, CancellationTokenInst=Settings.CancellationTokenInst)
+                    SampleOne = os.pread(OpenedFileOne.fileno(), Settings.PrefilterSampleSize, SampleOffset)
+                    SampleTwo = os.pread(OpenedFileTwo.fileno(), Settings.PrefilterSampleSize, SampleOffset)
+                    if Settings.MetricsInst is not None:
+                        Settings.MetricsInst.AddCount("Bytes", len(SampleOne) + len(SampleTwo))
+                    if SampleOne != SampleTwo:
+                        return Rejection("Samples", f"{FileOne.RelativePath} differs in its {SampleName} sample (bytes {SampleOffset} to {SampleOffset + Settings.PrefilterSampleSize}).")
+
+    return None
+
+
+def GetSampleOffsets(FileSize, SampleSize):
+    return {"head": 0, "middle": max(0, (FileSize - SampleSize) // 2), "tail": max(0, FileSize - SampleSize)}
@@ -0,0 +1,48 @@
+import threading
+import time
+
+
+class ProgressReporter:
+    def __init__(self, Callback, InputScans, MinimumInterval=0.1):
+        # Variables
+        self.Lock = threading.Lock()
+        self.LastReportTime = 0.0
+        self.Progress = [{"Input": InputScanInst.Input, "HashedBytes": 0, "TotalBytes": InputScanInst.TotalSize, "FilesDone": 0, "TotalFiles": len(InputScanInst.Files), "CurrentFile": None} for InputScanInst in InputScans]
+
+        # Store Parameters
+        self.Callback = Callback
+        self.MinimumInterval = MinimumInterval
+
+    def FileStarted(self, InputIndex, File):
+        with self.Lock:
+            self.Progress[InputIndex]["CurrentFile"] = File.RelativePath
+        self.Report()
+
+    def BytesHashed(self, InputIndex, ByteCount):
+        with self.Lock:
+            self.Progress[InputIndex]["HashedBytes"] += ByteCount
+        self.Report()
+
+    def FileDone(self, InputIndex, File=None):
+        with self.Lock:
+            self.Progress[InputIndex]["FilesDone"] += 1
+        self.Report()
+
+    def Finish(self):
+        self.Report(Force=True)
+
+    def Report(self, Force=False):
+        # Reports are rate-limited so callers can report every chunk without flooding the callback
+        with self.Lock:
+            CurrentTime = time.monotonic()
+            if not Force and CurrentTime - self.LastReportTime < self.MinimumInterval:
+                return
+            self.LastReportTime = CurrentTime
+            Progress = [dict(InputProgress) for InputProgress in self.Progress]
+        self.Callback(Progress)
+
+
+def CreateProgressReporter(Settings, InputScans):
+    if Settings.ProgressCallback is None:
+        return None
+    return ProgressReporter(Settings.ProgressCallback, InputScans, MinimumInterval=Settings.ProgressInterval)
@@ -0,0 +1,73 @@
+import ctypes
+import os
+import sys
+import threading
+import time
+
+# Linux ioprio_set System Call Numbers by Machine
+IOPrioritySetSyscalls = {"x86_64": 251, "i386": 289, "i686": 289, "aarch64": 30, "riscv64": 30, "armv7l": 314, "ppc64le": 273, "s390x": 282}
+IOPriorityWhoProcess = 1
+IOPriorityClassIdle = 3
+IOPriorityClassShift = 13
+
+
+class TokenBucket:
+    def __init__(self, Rate, Capacity):
+        # Variables
+        self.Tokens = Capacity
+        self.LastRefillTime = time.monotonic()
+
+        # Store Parameters
+        self.Rate = Rate
+        self.Capacity = Capacity
+
+    def Reserve(self, Amount):
+        # Tokens may go negative, so a reader taking more than the bucket holds waits off the debt instead of being refused
+        CurrentTime = time.monotonic()
+        self.Tokens = min(self.Capacity, self.Tokens + (CurrentTime - self.LastRefillTime) * self.Rate)
+        self.LastRefillTime = CurrentTime
+        self.Tokens -= Amount
+        return max(0.0, -self.Tokens / self.Rate)
+
+
+class RateLimiter:
+    def __init__(self, BytesPerSecond=None, FilesPerSecond=None):
+        # Variables
+        self.Lock = threading.Lock()
+
+        # Buckets (each holds one second of its rate, so short bursts are allowed but the average never exceeds it)
+        self.ByteBucket = TokenBucket(BytesPerSecond, BytesPerSecond) if BytesPerSecond else None
+        self.FileBucket = TokenBucket(FilesPerSecond, max(1, FilesPerSecond)) if FilesPerSecond else None
+
+    def Acquire(self, ByteCount=0, FileCount=0, CancellationTokenInst=None):
+        # All readers share the buckets, so the limits apply to the whole comparison
+        with self.Lock:
+            Delay = 0.0
+            if self.ByteBucket is not None and ByteCount > 0:
+                Delay = max(Delay, self.ByteBucket.Reserve(ByteCount))
+            if self.FileBucket is not None and FileCount > 0:
+                Delay = max(Delay, self.FileBucket.Reserve(FileCount))
+        if Delay > 0:
+            if CancellationTokenInst is not None:
+                CancellationTokenInst.CancelledEvent.wait(Delay)
+            else:
+                time.sleep(Delay)
+
+
+def LimitRate(RateLimiterInst, ByteCount=0, FileCount=0, CancellationTokenInst=None):
+    if RateLimiterInst is not None:
+        RateLimiterInst.Acquire(ByteCount=ByteCount, FileCount=FileCount, CancellationTokenInst=CancellationTokenInst)
+
+
+def SetLowIOPriority():
+    # Puts the calling thread, and threads it starts afterwards, in the idle I/O scheduling class, so its reads only use otherwise idle disk time
+    if not sys.platform.startswith("linux"):
+        return False
+    SyscallNumber = IOPrioritySetSyscalls.get(os.uname().machine)
+    if SyscallNumber is None:
+        return False
+    try:
+        LibC = ctypes.CDLL(None, use_errno=True)
+        return LibC.syscall(SyscallNumber, IOPriorityWhoProcess, 0, IOPriorityClassIdle << IOPriorityClassShift) == 0
+    except (OSError, AttributeError):
+        return False
@@ -0,0 +1,141 @@
+import copy
+import json
+import math
+import os
+import queue
+import threading
+import time
+
+from Core.CancellationToken import CheckCancellation, ComparisonCancelled
+from Core.CompareInputs import CompareInputs, ComparisonMethods
+from Core.HashSettings import HashSettings
+
+# Resources Reserved by Each Running Job
+BatchResources = ["Threads", "OpenFiles", "BytesInFlight"]
+
+
+def LoadBatchJobs(JobFilePath):
+    # Job files hold one JSON object per line, such as {"InputOne": "/data/source", "InputTwo": "/replica/source"}; blank lines and lines starting with # are skipped
+    Jobs = []
+    with open(JobFilePath, "r", encoding="utf-8") as JobFile:
+        for LineNumber, Line in enumerate(JobFile, start=1):
+            if not Line.strip() or Line.lstrip().startswith("#"):
+                continue
+            try:
+                Job = json.loads(Line)
+            except ValueError:
+                print(f"Line {LineNumber} of the job file is not valid JSON.")
+                return None
+            if not isinstance(Job, dict) or not isinstance(Job.get("InputOne"), str) or not isinstance(Job.get("InputTwo"), str):
+                print(f"Line {LineNumber} of the job file needs an InputOne and an InputTwo.")
+                return None
+            if Job.get("Method", "Hash") not in ComparisonMethods:
+                print(f"Line {LineNumber} of the job file has an unknown method.  Available methods:\n\n{str(ComparisonMethods)}")
+                return None
+            Jobs.append({"Name": Job.get("Name"), "InputOne": Job["InputOne"], "InputTwo": Job["InputTwo"], "Method": Job.get("Method", "Hash"), "Algorithm": Job.get("Algorithm"), "IgnoreSingleFileNames": Job.get("IgnoreSingleFileNames", False), "Size": Job.get("Size")})
+    return Jobs
+
+
+def GetJobSize(Job, CancellationTokenInst=None, MaxEntries=4096):
+    # Jobs are ordered by the size of their first input, unless the job file gives one; at most a few thousand entries are walked, so sizing never holds up the first results, and trees too large for that count as larger than any other, keeping their order in the job file
+    if Job.get("Size") is not None:
+        return Job["Size"]
+    try:
+        if os.path.isfile(Job["InputOne"]):
+            return os.stat(Job["InputOne"]).st_size
+        Size = 0
+        EntryCount = 0
+        PendingDirectories = [Job["InputOne"]]
+        while PendingDirectories:
+            CheckCancellation(CancellationTokenInst)
+            with os.scandir(PendingDirectories.pop()) as DirectoryEntries:
+                for DirectoryEntry in DirectoryEntries:
+                    EntryCount += 1
+                    if EntryCount > MaxEntries:
+                        return math.inf
+                    if DirectoryEntry.is_file():
+                        Size += DirectoryEntry.stat().st_size
+                    elif DirectoryEntry.is_dir():
+                        PendingDirectories.append(DirectoryEntry.path)
+        return Size
+    except OSError:
+        # Jobs with unreadable inputs run first and fail quickly
+        return 0
+
+
+def GetJobReservation(Job, Settings):
+    # Upper bounds on what one comparison holds at once:  its reading threads (one per input plus its pool of workers), their open files, and their read buffers
+    ChunkSize = Settings.ChunkSize if Settings.ChunkSize is not None else Settings.MaximumChunkSize
+    if Job["Method"] == "Byte-for-Byte":
+        return {"Threads": 1, "OpenFiles": 2, "BytesInFlight": 2 * max(ChunkSize, Settings.InterleaveExtentSize)}
+    if Job["Method"] == "Merkle Tree":
+        return {"Threads": 2 * (Settings.Workers + 1), "OpenFiles": 2, "BytesInFlight": 2 * Settings.Workers * 2 * Settings.MerkleBlockSize}
+    return {"Threads": 2 * (Settings.Workers + 1), "OpenFiles": 2 * Settings.Workers, "BytesInFlight": 2 * Settings.Workers * ChunkSize}
+
+
+def RunBatchComparisons(Jobs, Settings=None, MaxThreads=16, MaxOpenFiles=64, MaxBytesInFlight=268435456):
+    # Yields the result of each job as it finishes; every job shares the settings, including the rate limiter and cancellation token, so limits and stopping apply to the whole batch
+    Settings = Settings if Settings is not None else HashSettings()
+    Limits = {"Threads": MaxThreads, "OpenFiles": MaxOpenFiles, "BytesInFlight": MaxBytesInFlight}
+
+    # Order Jobs Smallest First, So Small Jobs Never Wait Behind Huge Ones
+    JobSizes = []
+    for JobIndex, Job in enumerate(Jobs):
+        CheckCancellation(Settings.CancellationTokenInst)
+        JobSizes.append((GetJobSize(Job, Settings.CancellationTokenInst), JobIndex))
+    PendingJobs = [JobIndex for JobSize, JobIndex in sorted(JobSizes)]
+
+    # Each job runs in its own thread with its own copy of the settings, without per-job progress
+    JobSettings = copy.copy(Settings)
+    JobSettings.ProgressCallback = None
+    FinishedJobs = queue.Queue()
+
+    def RunJob(JobIndex):
+        Job = Jobs[JobIndex]
+        JobResult = {"Job": JobIndex, "Name": Job.get("Name"), "InputOne": Job["InputOne"], "InputTwo": Job["InputTwo"], "Method": Job["Method"], "Identical": None, "Result": None, "Error": None, "Seconds": None}
+        JobError = None
+        StartTime = time.perf_counter()
+        try:
+            Result = CompareInputs(Job["InputOne"], Job["InputTwo"], Method=Job["Method"], Algorithm=Job.get("Algorithm"), IgnoreSingleFileNames=Job.get("IgnoreSingleFileNames", False), Settings=JobSettings)
+            JobResult["Result"] = Result
+            JobResult["Identical"] = Result["Identical"] if isinstance(Result, dict) else Result
+            if Result is None:
+                JobResult["Error"] = "The inputs were not compared."
+        except ComparisonCancelled:
+            JobResult = None
+        except OSError as Error:
+            JobResult["Error"] = str(Error)
+        except Exception as Error:
+            # Unexpected errors are raised again by the batch loop, which would otherwise wait on this job forever
+            JobError = Error
+        finally:
+            if JobResult is not None:
+                JobResult["Seconds"] = time.perf_counter() - StartTime
+            FinishedJobs.put((JobIndex, JobResult, JobError))
+
+    # Admit Jobs in Order While Their Reservations Fit the Global Limits (a job larger than the limits runs alone)
+    Used = {Resource: 0 for Resource in BatchResources}
+    Running = {}
+    while PendingJobs or Running:
+        while PendingJobs and not (Settings.CancellationTokenInst is not None and Settings.CancellationTokenInst.Cancelled):
+            Reservation = GetJobReservation(Jobs[PendingJobs[0]], Settings)
+            if Running and any(Used[Resource] + Reservation[Resource] > Limits[Resource] for Resource in BatchResources):
+                break
+            JobIndex = PendingJobs.pop(0)
+            for Resource in BatchResources:
+                Used[Resource] += Reservation[Resource]
+            Running[JobIndex] = Reservation
+            threading.Thread(target=RunJob, args=(JobIndex,), name=f"BatchJob{JobIndex + 1}", daemon=True).start()
+        if not Running:
+            break
+
+        # Release a Finished Job's Reservation and Stream Its Result
+        JobIndex, JobResult, JobError = FinishedJobs.get()
+        for Resource in BatchResources:
+            Used[Resource] -= Running[JobIndex][Resource]
+        del Running[JobIndex]
+        if JobError is not None:
+            raise JobError
+        if JobResult is not None:
+            yield JobResult
+    CheckCancellation(Settings.CancellationTokenInst)
@@ -0,0 +1,64 @@
+import os
+
+from Core.CancellationToken import CheckCancellation
+from Core.Metrics import MeasureStage
+
+
+class ScannedFile:
+    __slots__ = ("RelativePath", "ManifestPath", "Path", "Stat", "Member")
+
+    def __init__(self, RelativePath, ManifestPath, Path, Stat, Member=None):
+        self.RelativePath = RelativePath
+        self.ManifestPath = ManifestPath
+        self.Path = Path
+        self.Stat = Stat
+        self.Member = Member
+
+
+class InputScan:
+    def __init__(self, Input, InputDirectory, Files, ArchiveType=None, MemberDigests=None):
+        self.Input = Input
+        self.InputDirectory = InputDirectory
+        self.Files = Files
+        self.ArchiveType = ArchiveType
+        self.MemberDigests = MemberDigests
+        self.TotalSize = sum(File.Stat.st_size for File in Files)
+
+    @property
+    def FilePaths(self):
+        return [File.RelativePath for File in self.Files]
+
+
+def ScanInput(Input, CancellationTokenInst=None, MetricsInst=None, FollowSymlinks=True):
+    # Symbolic links are followed unless the input is compared with an archive, which skips its own links
+    with MeasureStage(MetricsInst, "Scan"):
+        InputDirectory = os.path.dirname(Input)
+        RelativeInputPath = os.path.basename(Input)
+        Files = []
+
+        # Scan Single File
+        if os.path.isfile(Input):
+            Files.append(ScannedFile(RelativeInputPath, RelativeInputPath, Input, os.stat(Input)))
+            return InputScan(Input, InputDirectory, Files)
+
+        # Scan Directory Tree
+        PendingDirectories = [(Input, RelativeInputPath, "")]
+        while PendingDirectories:
+            CurrentDirectory, CurrentRelativePath, CurrentManifestPath = PendingDirectories.pop()
+            CheckCancellation(CancellationTokenInst)
+            if MetricsInst is not None:
+                MetricsInst.AddCount("Directories")
+            with os.scandir(CurrentDirectory) as DirectoryEntries:
+                for DirectoryEntry in DirectoryEntries:
+                    if not FollowSymlinks and DirectoryEntry.is_symlink():
+                        continue
+                    RelativePath = os.path.join(CurrentRelativePath, DirectoryEntry.name)
+                    ManifestPath = f"{CurrentManifestPath}{DirectoryEntry.name}"
+                    if DirectoryEntry.is_file():
+                        Files.append(ScannedFile(RelativePath, ManifestPath, DirectoryEntry.path, DirectoryEntry.stat()))
+                    elif DirectoryEntry.is_dir():
+                        PendingDirectories.append((DirectoryEntry.path, RelativePath, f"{ManifestPath}/"))
+
+        Files.sort(key=lambda File: File.RelativePath)
+
+        return InputScan(Input, InputDirectory, Files)
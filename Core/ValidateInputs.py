@@ -0,0 +1,27 @@
+import os
+
+from Core.ArchiveInput import IsArchiveFile
+
+
+def ValidateInputs(InputOne, InputTwo, IgnoreSingleFileNames=True, AllowArchives=False):
+    return ValidateManyInputs([InputOne, InputTwo], IgnoreSingleFileNames=IgnoreSingleFileNames, AllowArchives=AllowArchives)
+
+
+def ValidateManyInputs(Inputs, IgnoreSingleFileNames=True, AllowArchives=False):
+    if len(Inputs) < 2:
+        print("At least two inputs are needed to compare.")
+        return False
+    if not all(os.path.exists(Input) for Input in Inputs):
+        print("At least one input does not exist.")
+        return False
+    # With archives allowed, a zip or tar archive can stand in for the directory it would extract to
+    if not (all(os.path.isdir(Input) for Input in Inputs) or all(os.path.isfile(Input) for Input in Inputs) or (AllowArchives and all(os.path.isdir(Input) or IsArchiveFile(Input) for Input in Inputs))):
+        print("Inputs must both be files or both be directories." if len(Inputs) == 2 else "Inputs must all be files or all be directories.")
+        return False
+    if any(os.path.isdir(Input) for Input in Inputs) and IgnoreSingleFileNames:
+        print("File names can only be ignored when comparing single files.")
+        return False
+    if len(set(Inputs)) != len(Inputs):
+        print("Must select different inputs to compare.")
+        return False
+    return True
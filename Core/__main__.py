@@ -0,0 +1,250 @@
+import argparse
+import contextlib
+import json
+import os
+import signal
+import sys
+import traceback
+
+AbsoluteDirectoryPath = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if sys.path[0] != AbsoluteDirectoryPath:
+    sys.path.insert(0, AbsoluteDirectoryPath)
+
+from Core.CancellationToken import CancellationToken, ComparisonCancelled
+from Core.CompareInputs import CompareInputs, ComparisonMethods
+from Core.DeviceSchedule import DeviceSchedulingModes
+from Core.FindDuplicateFiles import FindDuplicateFiles
+from Core.HashAndCompareManyInputs import HashAndCompareManyInputs
+from Core.HashSettings import HashSettings
+from Core.ManifestFiles import CompareInputToManifest, ExportManifest, UpdateManifest
+from Core.Metrics import ProfileThread, SaveMetrics, SaveProfile
+from Core.PageCache import ReadModes
+from Core.RateLimiter import SetLowIOPriority
+from Core.RunBatchComparisons import LoadBatchJobs, RunBatchComparisons
+
+# Exit Codes
+IdenticalExitCode = 0
+NotIdenticalExitCode = 1
+ErrorExitCode = 2
+UnexpectedErrorExitCode = 3
+CancelledExitCode = 130
+
+
+def GetMethodArgument(Method):
+    return Method.lower().replace(" ", "-")
+
+
+def ParseByteCount(Value):
+    # Accepts plain byte counts or decimal suffixes, such as 500K, 50M, or 1G
+    Multipliers = {"K": 1000, "M": 1000000, "G": 1000000000}
+    Value = Value.strip().upper().removesuffix("B")
+    try:
+        if Value[-1:] in Multipliers:
+            return int(float(Value[:-1]) * Multipliers[Value[-1]])
+        return int(Value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid byte count: {Value}")
+
+
+def ParsePositiveInteger(Value):
+    try:
+        Integer = int(Value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer: {Value}")
+    if Integer <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0: {Value}")
+    return Integer
+
+
+def PrintProgress(Progress):
+    HashedBytes = sum(InputProgress["HashedBytes"] for InputProgress in Progress)
+    TotalBytes = sum(InputProgress["TotalBytes"] for InputProgress in Progress)
+    FilesDone = sum(InputProgress["FilesDone"] for InputProgress in Progress)
+    TotalFiles = sum(InputProgress["TotalFiles"] for InputProgress in Progress)
+    Percentage = (HashedBytes / TotalBytes) * 100 if TotalBytes > 0 else 100
+    print(f"\r{Percentage:5.1f}%  {FilesDone}/{TotalFiles} files", end="", file=sys.stderr, flush=True)
+
+
+def RunBatch(ParsedArguments, Settings, ResultStream):
+    try:
+        Jobs = LoadBatchJobs(ParsedArguments.batch)
+    except OSError as Error:
+        print(f"The job file could not be read.  {Error}")
+        return ErrorExitCode
+    if Jobs is None:
+        return ErrorExitCode
+
+    # Stream Each Result as Its Job Finishes (JSON Lines with --format json)
+    ExitCode = IdenticalExitCode
+    for JobResult in RunBatchComparisons(Jobs, Settings=Settings, MaxThreads=ParsedArguments.max_threads, MaxOpenFiles=ParsedArguments.max_open_files, MaxBytesInFlight=ParsedArguments.max_bytes_in_flight):
+        if JobResult["Identical"] is None:
+            ExitCode = ErrorExitCode
+        elif not JobResult["Identical"] and ExitCode == IdenticalExitCode:
+            ExitCode = NotIdenticalExitCode
+        if ParsedArguments.format == "json":
+            print(json.dumps(JobResult), file=ResultStream, flush=True)
+        else:
+            Status = "error" if JobResult["Identical"] is None else "identical" if JobResult["Identical"] else "not identical"
+            JobName = JobResult["Name"] if JobResult["Name"] is not None else f"Job {JobResult['Job'] + 1}"
+            print(f"{Status:<13}  {JobName}:  {JobResult['InputOne']}  {JobResult['InputTwo']}" + (f"  ({JobResult['Error']})" if JobResult["Error"] is not None else ""), file=ResultStream, flush=True)
+    return ExitCode
+
+
+def Main(Arguments=None):
+    # Parse Arguments
+    MethodArguments = {GetMethodArgument(Method): Method for Method in ComparisonMethods}
+    Parser = argparse.ArgumentParser(prog="python -m Core", description="Compare two files or directories without starting the interface.", epilog=f"Exit codes:  {IdenticalExitCode} if identical, {NotIdenticalExitCode} if not identical, {ErrorExitCode} if an error occurred, {UnexpectedErrorExitCode} if an unexpected error occurred, {CancelledExitCode} if interrupted.")
+    Parser.add_argument("Inputs", nargs="*", metavar="Input", help="files or directories to compare, or a zip or tar archive and a directory; with more than two, each input is hashed once and grouped with identical inputs")
+    Parser.add_argument("-a", "--algorithm", help="hash algorithm (defaults to md5, with sha1 as a fallback; \"fast\" selects blake3, xxh3_128, or blake2b, whichever is available first)")
+    Parser.add_argument("-m", "--method", choices=list(MethodArguments.keys()), default=GetMethodArgument("Hash"), help="comparison method (default: %(default)s)")
+    Parser.add_argument("-w", "--workers", type=int, default=1, help="files hashed concurrently per input (default: %(default)s)")
+    Parser.add_argument("-c", "--chunk-size", type=ParsePositiveInteger, help="bytes read per chunk (default: adapts to each file's size and block size)")
+    Parser.add_argument("--read-mode", choices=[ReadMode.lower() for ReadMode in ReadModes], default="buffered", help="buffered reads use the page cache; streaming reads drop hashed pages from it; direct reads bypass it where the filesystem allows (default: %(default)s)")
+    Parser.add_argument("--device-scheduling", choices=[DeviceSchedulingMode.lower() for DeviceSchedulingMode in DeviceSchedulingModes], default="auto", help="interleaved reads inputs on the same device one long extent at a time instead of seeking between them; auto interleaves only devices that report they seek (default: %(default)s)")
+    Parser.add_argument("--no-memory-map", action="store_true", help="read large files instead of hashing them from a memory map")
+    Parser.add_argument("-f", "--format", choices=["text", "json"], default="text", help="output format (default: %(default)s)")
+    Parser.add_argument("--ignore-names", action="store_true", help="ignore file names when comparing single files")
+    Parser.add_argument("--max-bytes-per-second", type=ParseByteCount, metavar="BYTES", help="limit the combined reading speed of all inputs, e.g. 50M")
+    Parser.add_argument("--max-files-per-second", type=float, metavar="FILES", help="limit how many files are opened per second across all inputs")
+    Parser.add_argument("--low-io-priority", action="store_true", help="read only when the disks are otherwise idle (Linux only)")
+    Parser.add_argument("--progress", action="store_true", help="print progress to stderr")
+    Parser.add_argument("--digest-cache", metavar="PATH", help="reuse and store per-file digests in this cache file")
+    Parser.add_argument("--metrics", metavar="PATH", help="save per-stage timings, throughput, open latencies, and the slowest files to this file (Prometheus text format if it ends in .prom, otherwise JSON)")
+    Parser.add_argument("--profile", metavar="PATH", help="profile the comparison with cProfile and save the statistics to this file, for python -m pstats")
+    ManifestGroup = Parser.add_mutually_exclusive_group()
+    ManifestGroup.add_argument("--export-manifest", metavar="PATH", help="hash a single input and save its per-file digests to this manifest file (.sqlite3 or .db for a database, otherwise sha256sum-compatible text)")
+    ManifestGroup.add_argument("--manifest", metavar="PATH", help="compare a single input against a manifest file saved earlier, reading only the input")
+    ManifestGroup.add_argument("--update-manifest", metavar="PATH", help="compare a single input against a manifest file saved earlier, rehashing only files whose size, modification time, or inode changed, and save the updated manifest")
+    Parser.add_argument("--find-duplicates", action="store_true", help="list groups of identical files within and across the inputs instead of comparing them; exits with 0 if any are found and 1 otherwise")
+    Parser.add_argument("--across-inputs", action="store_true", help="with --find-duplicates, only list groups that span more than one input")
+    Parser.add_argument("--batch", metavar="JOBFILE", help="run the comparisons listed in this job file, one JSON object per line with an InputOne, an InputTwo, and optionally a Name, Method, Algorithm, IgnoreSingleFileNames, or Size; smaller jobs run first and each result is printed as its job finishes")
+    Parser.add_argument("--max-threads", type=int, default=16, help="with --batch, reading threads shared by all running jobs (default: %(default)s)")
+    Parser.add_argument("--max-open-files", type=int, default=64, help="with --batch, files open at once across all running jobs (default: %(default)s)")
+    Parser.add_argument("--max-bytes-in-flight", type=ParseByteCount, default=268435456, metavar="BYTES", help="with --batch, read buffer bytes across all running jobs, e.g. 256M (default: %(default)s)")
+    Parser.add_argument("--block-size", type=int, default=4194304, help="bytes per block for the merkle-tree method (default: %(default)s)")
+    Parser.add_argument("--merkle-trees", metavar="DIRECTORY", help="store block digests for the merkle-tree method in this directory and reuse them while files are unchanged")
+    ParsedArguments = Parser.parse_args(Arguments)
+    UseManifestFile = any(ManifestFilePath is not None for ManifestFilePath in (ParsedArguments.export_manifest, ParsedArguments.manifest, ParsedArguments.update_manifest))
+    if UseManifestFile and len(ParsedArguments.Inputs) != 1:
+        Parser.error("exactly one input is needed with a manifest file")
+    if ParsedArguments.batch is not None and (ParsedArguments.Inputs or UseManifestFile or ParsedArguments.find_duplicates):
+        Parser.error("a job file replaces the inputs, manifest files, and duplicate finding")
+    if ParsedArguments.find_duplicates and UseManifestFile:
+        Parser.error("duplicates cannot be found with a manifest file")
+    if ParsedArguments.batch is None and not ParsedArguments.find_duplicates and not ParsedArguments.Inputs:
+        Parser.error("at least one input is needed")
+    if ParsedArguments.batch is None and not UseManifestFile and not ParsedArguments.find_duplicates and len(ParsedArguments.Inputs) < 2:
+        Parser.error("at least two inputs are needed to compare")
+    if len(ParsedArguments.Inputs) > 2 and ParsedArguments.method != GetMethodArgument("Hash"):
+        Parser.error("only the hash method can compare more than two inputs")
+
+    # Compare
+    Settings = HashSettings(Workers=ParsedArguments.workers, ChunkSize=ParsedArguments.chunk_size, UseMemoryMap=not ParsedArguments.no_memory_map, ReadMode=ParsedArguments.read_mode.capitalize(), DeviceScheduling=ParsedArguments.device_scheduling.capitalize(), DigestCachePath=ParsedArguments.digest_cache, MerkleBlockSize=ParsedArguments.block_size, MerkleTreeDirectory=ParsedArguments.merkle_trees, MaxBytesPerSecond=ParsedArguments.max_bytes_per_second, MaxFilesPerSecond=ParsedArguments.max_files_per_second, UseLowIOPriority=ParsedArguments.low_io_priority, CollectMetrics=ParsedArguments.metrics is not None, Profile=ParsedArguments.profile is not None, ProgressCallback=PrintProgress if ParsedArguments.progress else None, ProgressInterval=0.5)
+
+    # Lower I/O Priority for This Process's Readers
+    if Settings.UseLowIOPriority:
+        SetLowIOPriority()
+
+    # Stop Cleanly on Interrupt, Keeping Digests Already Cached
+    Settings.CancellationTokenInst = CancellationToken()
+    signal.signal(signal.SIGINT, lambda SignalNumber, Frame: Settings.CancellationTokenInst.Cancel())
+
+    # Core messages go to stderr so they never mix with the result on stdout
+    ResultStream = sys.stdout
+    try:
+        with contextlib.redirect_stdout(sys.stderr), ProfileThread(Settings.MetricsInst):
+            if ParsedArguments.batch is not None:
+                return RunBatch(ParsedArguments, Settings, ResultStream)
+            if ParsedArguments.export_manifest is not None:
+                Manifest = ExportManifest(ParsedArguments.Inputs[0], ParsedArguments.export_manifest, Algorithm=ParsedArguments.algorithm, Settings=Settings)
+                Result = None if Manifest is None else {"Identical": True, "Manifest": ParsedArguments.export_manifest, "Algorithm": Manifest["Algorithm"], "Files": len(Manifest["Files"])}
+            elif ParsedArguments.manifest is not None:
+                Result = CompareInputToManifest(ParsedArguments.Inputs[0], ParsedArguments.manifest, Algorithm=ParsedArguments.algorithm, IgnoreSingleFileNames=ParsedArguments.ignore_names, Settings=Settings)
+            elif ParsedArguments.update_manifest is not None:
+                Result = UpdateManifest(ParsedArguments.Inputs[0], ParsedArguments.update_manifest, Algorithm=ParsedArguments.algorithm, IgnoreSingleFileNames=ParsedArguments.ignore_names, Settings=Settings)
+            elif ParsedArguments.find_duplicates:
+                Result = FindDuplicateFiles(ParsedArguments.Inputs, Algorithm=ParsedArguments.algorithm, AcrossInputsOnly=ParsedArguments.across_inputs, Settings=Settings)
+            elif len(ParsedArguments.Inputs) > 2:
+                Result = HashAndCompareManyInputs(ParsedArguments.Inputs, Algorithm=ParsedArguments.algorithm, IgnoreSingleFileNames=ParsedArguments.ignore_names, Settings=Settings)
+            else:
+                Result = CompareInputs(ParsedArguments.Inputs[0], ParsedArguments.Inputs[1], Method=MethodArguments[ParsedArguments.method], Algorithm=ParsedArguments.algorithm, IgnoreSingleFileNames=ParsedArguments.ignore_names, Settings=Settings)
+    except ComparisonCancelled:
+        print("\nComparison stopped.", file=sys.stderr)
+        return CancelledExitCode
+    except OSError as Error:
+        print(f"An error occurred.  {Error}", file=sys.stderr)
+        return ErrorExitCode
+    except Exception:
+        # Unexpected errors keep their traceback but exit with their own code, never one that reads as a comparison result
+        traceback.print_exc()
+        return UnexpectedErrorExitCode
+    finally:
+        # Metrics and profiles are saved for stopped comparisons too, covering the work done before stopping
+        if Settings.MetricsInst is not None:
+            Settings.MetricsInst.Finish()
+            if ParsedArguments.metrics is not None:
+                SaveMetrics(Settings.MetricsInst, ParsedArguments.metrics)
+            if ParsedArguments.profile is not None:
+                SaveProfile(Settings.MetricsInst, ParsedArguments.profile)
+    if ParsedArguments.find_duplicates:
+        Identical = None if Result is None else bool(Result["Groups"])
+    else:
+        Identical = Result["Identical"] if isinstance(Result, dict) else Result
+    if ParsedArguments.progress:
+        print(file=sys.stderr)
+
+    # Output Result
+    if ParsedArguments.format == "json":
+        print(json.dumps(Result if isinstance(Result, dict) else {"Identical": Result}, indent=2))
+    elif Identical is None:
+        print("An error occurred.  Inputs were not compared.", file=sys.stderr)
+    elif ParsedArguments.find_duplicates:
+        for Group in Result["Groups"]:
+            print(f"{len(Group['Files'])} identical files of {Group['Size']} bytes:")
+            for File in Group["Files"]:
+                print(f"    {File}")
+        print(f"Found {Result['DuplicateFiles']} duplicate files ({Result['DuplicateBytes']} bytes) among {Result['ScannedFiles']} files, reading {Result['ReadBytes']} of {Result['ScannedBytes']} bytes.")
+    elif ParsedArguments.export_manifest is not None:
+        print(f"Exported a manifest of {Result['Files']} files to {Result['Manifest']}.")
+    elif Identical:
+        print("Inputs are identical.")
+        if ParsedArguments.update_manifest is not None:
+            print(f"Rehashed {Result['Rehashed']} files and reused {Result['Reused']} digests from the manifest.")
+    else:
+        print("Inputs are not identical.")
+        if isinstance(Result, dict):
+            for Key, Value in Result.items():
+                if Key == "Identical" or Value in (None, [], {}):
+                    continue
+                if Key == "Groups":
+                    for GroupIndex, Group in enumerate(Value):
+                        print(f"Group {GroupIndex + 1}:")
+                        for Input in Group:
+                            print(f"    {Input}")
+                elif Key in ("Renamed", "Moved"):
+                    print(f"{Key}:")
+                    for OldPath, NewPath in Value.items():
+                        print(f"    {OldPath} -> {NewPath}")
+                elif Key == "MismatchedRanges":
+                    print(f"{Key}:")
+                    for Item, Ranges in Value.items():
+                        print(f"    {Item}:  " + ", ".join(f"bytes {Start}-{End - 1}" for Start, End in Ranges))
+                elif isinstance(Value, dict):
+                    print(f"{Key}:")
+                    for Item, ItemValue in Value.items():
+                        print(f"    {ItemValue}  {Item}")
+                elif isinstance(Value, list):
+                    print(f"{Key}:")
+                    for Item in Value:
+                        print(f"    {Item}")
+                else:
+                    print(f"{Key}:  {Value}")
+
+    # Exit Code
+    if Identical is None:
+        return ErrorExitCode
+    return IdenticalExitCode if Identical else NotIdenticalExitCode
+
+
+if __name__ == "__main__":
+    sys.exit(Main())
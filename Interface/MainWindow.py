@@ -1,16 +1,17 @@
 import copy
-import hashlib
 import json
 import os
-import threading
 from math import floor
 
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QIcon, QPalette, QColor, QAction
-from PyQt6.QtWidgets import QMainWindow, QMessageBox, QApplication, QGridLayout, QFrame, QLineEdit, QPushButton, QSizePolicy, QRadioButton, QComboBox, QFileDialog, QCheckBox, QProgressBar, QLabel, QInputDialog
+from PyQt6.QtWidgets import QMainWindow, QMessageBox, QApplication, QGridLayout, QFrame, QLineEdit, QPushButton, QSizePolicy, QRadioButton, QComboBox, QFileDialog, QCheckBox, QProgressBar, QLabel, QInputDialog, QSpinBox
 
+from Core.CompareInputs import ComparisonMethods
+from Core.HashBackends import GetDefaultAlgorithm, GetSelectableAlgorithms, ResolveAlgorithm
+from Core.HashSettings import HashSettings
+from Core.ManifestFiles import GetExtensionAlgorithm
 from Interface.Threads.ComparisonThread import ComparisonThread
-from Interface.Threads.StatusThread import StatusThread
 
 
 class MainWindow(QMainWindow):
@@ -23,6 +24,7 @@ class MainWindow(QMainWindow):
 
         # Variables
         self.ComparisonInProgress = False
+        self.CurrentComparisonThread = None
         self.LastSelectedFilePathOne = None
         self.LastSelectedFilePathTwo = None
 
@@ -63,6 +65,28 @@ class MainWindow(QMainWindow):
         self.FileModeRadioButton = QRadioButton("File Mode")
         self.IgnoreNamesInFileModeCheckBox = QCheckBox("Ignore names in file mode?")
         self.IgnoreNamesInFileModeCheckBox.setChecked(True)
+        self.UseDigestCacheCheckBox = QCheckBox("Use digest cache?")
+        self.UseDigestCacheCheckBox.setToolTip("Reuse digests of files whose size, modification time, and inode are unchanged since they were last hashed.")
+
+        self.MethodComboBox = QComboBox()
+        self.MethodComboBox.setEditable(False)
+        self.MethodComboBox.addItems(ComparisonMethods)
+        self.MethodComboBox.setToolTip("Byte-for-byte comparison reads both inputs in lockstep and stops at the first difference.\n\nPer-file manifest comparison hashes each file separately and lists the files that were added, removed, or changed.\n\nRename-aware comparison matches files by size and digest, listing renamed and moved files apart from changed ones.")
+        self.MethodComboBox.currentTextChanged.connect(lambda Method: self.AlgorithmComboBox.setEnabled(Method != "Byte-for-Byte" and not self.ComparisonInProgress))
+
+        self.LowIOPriorityCheckBox = QCheckBox("Low I/O priority?")
+        self.LowIOPriorityCheckBox.setToolTip("Read only when the disks are otherwise idle (Linux only).")
+
+        self.MaxSpeedSpinBox = QSpinBox()
+        self.MaxSpeedSpinBox.setRange(0, 100000)
+        self.MaxSpeedSpinBox.setSuffix(" MB/s")
+        self.MaxSpeedSpinBox.setSpecialValueText("Unlimited speed")
+        self.MaxSpeedSpinBox.setToolTip("Maximum combined reading speed for all inputs, so comparisons on shared storage leave bandwidth for other work.")
+
+        self.WorkersLabel = QLabel("Workers per input:")
+        self.WorkersSpinBox = QSpinBox()
+        self.WorkersSpinBox.setRange(1, 64)
+        self.WorkersSpinBox.setToolTip("Number of files hashed concurrently for each input.  Values above 1 help most on SSDs and with many small files.")
 
         self.AlgorithmComboBox = QComboBox()
         self.AlgorithmComboBox.setEditable(False)
@@ -91,6 +115,15 @@ class MainWindow(QMainWindow):
         self.CompareHashesButton.clicked.connect(self.CompareHashes)
         self.CompareHashesButton.setSizePolicy(self.ButtonAndLineEditSizePolicy)
 
+        self.PauseButton = QPushButton("Pause")
+        self.PauseButton.clicked.connect(self.TogglePause)
+        self.PauseButton.setSizePolicy(self.ButtonAndLineEditSizePolicy)
+        self.PauseButton.setDisabled(True)
+        self.StopButton = QPushButton("Stop")
+        self.StopButton.clicked.connect(self.StopComparison)
+        self.StopButton.setSizePolicy(self.ButtonAndLineEditSizePolicy)
+        self.StopButton.setDisabled(True)
+
         self.FileOneProgressLabel = QLabel("File One Progress")
         self.FileOneProgressBar = QProgressBar()
         self.FileTwoProgressLabel = QLabel("File Two Progress")
@@ -101,6 +134,11 @@ class MainWindow(QMainWindow):
         self.DisableList.append(self.FolderModeRadioButton)
         self.DisableList.append(self.FileModeRadioButton)
         self.DisableList.append(self.IgnoreNamesInFileModeCheckBox)
+        self.DisableList.append(self.UseDigestCacheCheckBox)
+        self.DisableList.append(self.WorkersSpinBox)
+        self.DisableList.append(self.LowIOPriorityCheckBox)
+        self.DisableList.append(self.MaxSpeedSpinBox)
+        self.DisableList.append(self.MethodComboBox)
         self.DisableList.append(self.AlgorithmComboBox)
         self.DisableList.append(self.FileOneLineEdit)
         self.DisableList.append(self.FileOneSelectButton)
@@ -115,24 +153,32 @@ class MainWindow(QMainWindow):
         self.Layout.addWidget(self.FolderModeRadioButton, 0, 0, Qt.AlignmentFlag.AlignRight)
         self.Layout.addWidget(self.FileModeRadioButton, 0, 1)
         self.Layout.addWidget(self.IgnoreNamesInFileModeCheckBox, 0, 2)
-        self.Layout.addWidget(self.AlgorithmComboBox, 0, 3)
-        self.Layout.addWidget(self.FileOneLineEdit, 1, 0, 1, 3)
-        self.Layout.addWidget(self.FileOneSelectButton, 1, 3)
-        self.Layout.addWidget(self.FileTwoLineEdit, 2, 0, 1, 3)
-        self.Layout.addWidget(self.FileTwoSelectButton, 2, 3)
-        self.Layout.addWidget(self.CompareHashesButton, 3, 0, 1, 4)
+        self.Layout.addWidget(self.MethodComboBox, 0, 3)
+        self.Layout.addWidget(self.AlgorithmComboBox, 0, 4)
+        self.Layout.addWidget(self.FileOneLineEdit, 1, 0, 1, 4)
+        self.Layout.addWidget(self.FileOneSelectButton, 1, 4)
+        self.Layout.addWidget(self.FileTwoLineEdit, 2, 0, 1, 4)
+        self.Layout.addWidget(self.FileTwoSelectButton, 2, 4)
+        self.Layout.addWidget(self.UseDigestCacheCheckBox, 3, 0)
+        self.Layout.addWidget(self.LowIOPriorityCheckBox, 3, 1)
+        self.Layout.addWidget(self.WorkersLabel, 3, 2, Qt.AlignmentFlag.AlignRight)
+        self.Layout.addWidget(self.WorkersSpinBox, 3, 3)
+        self.Layout.addWidget(self.MaxSpeedSpinBox, 3, 4)
+        self.Layout.addWidget(self.CompareHashesButton, 4, 0, 1, 3)
+        self.Layout.addWidget(self.PauseButton, 4, 3)
+        self.Layout.addWidget(self.StopButton, 4, 4)
         self.ProgressLayout = QGridLayout()
         self.ProgressLayout.addWidget(self.FileOneProgressLabel, 0, 0)
         self.ProgressLayout.addWidget(self.FileOneProgressBar, 0, 1)
         self.ProgressLayout.addWidget(self.FileTwoProgressLabel, 0, 2)
         self.ProgressLayout.addWidget(self.FileTwoProgressBar, 0, 3)
-        self.Layout.addLayout(self.ProgressLayout, 4, 0, 1, 4)
+        self.Layout.addLayout(self.ProgressLayout, 5, 0, 1, 5)
 
         # Set and Configure Layout
         self.Layout.setColumnStretch(0, 1)
         self.Layout.setColumnStretch(1, 1)
         self.Layout.setColumnStretch(2, 1)
-        self.Layout.setRowStretch(3, 1)
+        self.Layout.setRowStretch(4, 1)
         self.Frame.setLayout(self.Layout)
 
         # Create Actions
@@ -154,6 +200,18 @@ class MainWindow(QMainWindow):
         self.SetThemeAction = QAction("Set Theme")
         self.SetThemeAction.triggered.connect(self.SetTheme)
 
+        self.CompareMultipleInputsAction = QAction("Compare Multiple Inputs")
+        self.CompareMultipleInputsAction.triggered.connect(self.CompareMultipleInputs)
+
+        self.ExportManifestAction = QAction("Export Manifest")
+        self.ExportManifestAction.triggered.connect(self.ExportManifest)
+
+        self.CompareWithManifestAction = QAction("Compare with Manifest")
+        self.CompareWithManifestAction.triggered.connect(lambda: self.CompareWithManifest())
+
+        self.UpdateManifestAction = QAction("Re-Verify and Update Manifest")
+        self.UpdateManifestAction.triggered.connect(lambda: self.CompareWithManifest(ManifestMode="Update"))
+
         self.QuitAction = QAction("Quit")
         self.QuitAction.triggered.connect(self.close)
 
@@ -161,6 +219,12 @@ class MainWindow(QMainWindow):
         self.MenuBar = self.menuBar()
 
         self.FileMenu = self.MenuBar.addMenu("File")
+        self.FileMenu.addAction(self.CompareMultipleInputsAction)
+        self.FileMenu.addSeparator()
+        self.FileMenu.addAction(self.ExportManifestAction)
+        self.FileMenu.addAction(self.CompareWithManifestAction)
+        self.FileMenu.addAction(self.UpdateManifestAction)
+        self.FileMenu.addSeparator()
         self.FileMenu.addAction(self.SetThemeAction)
         self.FileMenu.addSeparator()
         self.FileMenu.addAction(self.QuitAction)
@@ -177,12 +241,42 @@ class MainWindow(QMainWindow):
                 TargetRadioButton = self.FolderModeRadioButton if json.loads(FolderModeConfigFile.read()) else self.FileModeRadioButton
                 TargetRadioButton.setChecked(True)
 
+        # Method
+        MethodFile = self.GetResourcePath("Configs/Method.cfg")
+        if os.path.isfile(MethodFile):
+            with open(MethodFile, "r") as MethodConfigFile:
+                self.MethodComboBox.setCurrentText(json.loads(MethodConfigFile.read()))
+
         # Ignore Names
         IgnoreNamesFile = self.GetResourcePath("Configs/IgnoreNames.cfg")
         if os.path.isfile(IgnoreNamesFile):
             with open(IgnoreNamesFile, "r") as IgnoreNamesConfigFile:
                 self.IgnoreNamesInFileModeCheckBox.setChecked(json.loads(IgnoreNamesConfigFile.read()))
 
+        # Use Digest Cache
+        UseDigestCacheFile = self.GetResourcePath("Configs/UseDigestCache.cfg")
+        if os.path.isfile(UseDigestCacheFile):
+            with open(UseDigestCacheFile, "r") as UseDigestCacheConfigFile:
+                self.UseDigestCacheCheckBox.setChecked(json.loads(UseDigestCacheConfigFile.read()))
+
+        # Workers
+        WorkersFile = self.GetResourcePath("Configs/Workers.cfg")
+        if os.path.isfile(WorkersFile):
+            with open(WorkersFile, "r") as WorkersConfigFile:
+                self.WorkersSpinBox.setValue(json.loads(WorkersConfigFile.read()))
+
+        # Low I/O Priority
+        LowIOPriorityFile = self.GetResourcePath("Configs/LowIOPriority.cfg")
+        if os.path.isfile(LowIOPriorityFile):
+            with open(LowIOPriorityFile, "r") as LowIOPriorityConfigFile:
+                self.LowIOPriorityCheckBox.setChecked(json.loads(LowIOPriorityConfigFile.read()))
+
+        # Max Speed
+        MaxSpeedFile = self.GetResourcePath("Configs/MaxSpeed.cfg")
+        if os.path.isfile(MaxSpeedFile):
+            with open(MaxSpeedFile, "r") as MaxSpeedConfigFile:
+                self.MaxSpeedSpinBox.setValue(json.loads(MaxSpeedConfigFile.read()))
+
         # Keybindings
         KeybindingsFile = self.GetResourcePath("Configs/Keybindings.cfg")
         if os.path.isfile(KeybindingsFile):
@@ -210,10 +304,30 @@ class MainWindow(QMainWindow):
         with open(self.GetResourcePath("Configs/FolderMode.cfg"), "w") as FolderModeConfigFile:
             FolderModeConfigFile.write(json.dumps(self.FolderModeRadioButton.isChecked()))
 
+        # Method
+        with open(self.GetResourcePath("Configs/Method.cfg"), "w") as MethodConfigFile:
+            MethodConfigFile.write(json.dumps(self.MethodComboBox.currentText()))
+
         # Ignore Names
         with open(self.GetResourcePath("Configs/IgnoreNames.cfg"), "w") as IgnoreNamesConfigFile:
             IgnoreNamesConfigFile.write(json.dumps(self.IgnoreNamesInFileModeCheckBox.isChecked()))
 
+        # Use Digest Cache
+        with open(self.GetResourcePath("Configs/UseDigestCache.cfg"), "w") as UseDigestCacheConfigFile:
+            UseDigestCacheConfigFile.write(json.dumps(self.UseDigestCacheCheckBox.isChecked()))
+
+        # Workers
+        with open(self.GetResourcePath("Configs/Workers.cfg"), "w") as WorkersConfigFile:
+            WorkersConfigFile.write(json.dumps(self.WorkersSpinBox.value()))
+
+        # Low I/O Priority
+        with open(self.GetResourcePath("Configs/LowIOPriority.cfg"), "w") as LowIOPriorityConfigFile:
+            LowIOPriorityConfigFile.write(json.dumps(self.LowIOPriorityCheckBox.isChecked()))
+
+        # Max Speed
+        with open(self.GetResourcePath("Configs/MaxSpeed.cfg"), "w") as MaxSpeedConfigFile:
+            MaxSpeedConfigFile.write(json.dumps(self.MaxSpeedSpinBox.value()))
+
         # Keybindings
         with open(self.GetResourcePath("Configs/Keybindings.cfg"), "w") as ConfigFile:
             ConfigFile.write(json.dumps(self.Keybindings, indent=2))
@@ -233,14 +347,9 @@ class MainWindow(QMainWindow):
         self.LastSelectedFilePathTwo = None
 
     def PopulateAlgorithmList(self):
-        AvailableAlgorithms = sorted(hashlib.algorithms_available)
-        self.AlgorithmComboBox.addItems(AvailableAlgorithms)
-        DefaultAlgorithmOptions = ("md5", "sha1")
-        DefaultAlgorithm = None
-        for DefaultAlgorithmOption in DefaultAlgorithmOptions:
-            if DefaultAlgorithmOption in AvailableAlgorithms:
-                DefaultAlgorithm = DefaultAlgorithmOption
-                break
+        self.AlgorithmComboBox.addItems(GetSelectableAlgorithms())
+        self.AlgorithmComboBox.setToolTip("\"fast\" selects the fastest installed algorithm:  BLAKE3 or xxHash if installed, otherwise BLAKE2b.")
+        DefaultAlgorithm = GetDefaultAlgorithm()
         if DefaultAlgorithm is not None:
             self.AlgorithmComboBox.setCurrentText(DefaultAlgorithm)
 
@@ -287,26 +396,109 @@ class MainWindow(QMainWindow):
         else:
             IgnoreNames = False
 
+        # Create Hash Settings
+        Settings = self.CreateHashSettings()
+
         # Compare
         self.SetComparisonInProgress(True)
-        ComparisonThreadInst = ComparisonThread(FileOne, FileTwo, Algorithm=self.AlgorithmComboBox.currentText(), IgnoreSingleFileNames=IgnoreNames)
+        ComparisonThreadInst = ComparisonThread(FileOne, FileTwo, Algorithm=self.AlgorithmComboBox.currentText(), IgnoreSingleFileNames=IgnoreNames, Method=self.MethodComboBox.currentText(), Settings=Settings)
+        self.StartComparisonThread(ComparisonThreadInst)
+
+    def CompareMultipleInputs(self):
+        if self.ComparisonInProgress:
+            return
+
+        # Select Inputs
+        if self.FileModeRadioButton.isChecked():
+            Inputs = QFileDialog.getOpenFileNames(caption="Select Files")[0]
+        else:
+            Inputs = []
+            while Selected := QFileDialog.getExistingDirectory(caption=f"Select Folder {len(Inputs) + 1} (Cancel When Done)", directory=os.path.dirname(Inputs[-1]) if Inputs else ""):
+                if Selected not in Inputs:
+                    Inputs.append(Selected)
+        if len(Inputs) < 2:
+            if Inputs:
+                self.DisplayMessageBox("At least two inputs must be selected to compare.")
+            return
+
+        # Check Whether to Ignore File Names
+        IgnoreNames = self.FileModeRadioButton.isChecked() and self.IgnoreNamesInFileModeCheckBox.isChecked()
+
+        # Create Hash Settings
+        Settings = self.CreateHashSettings()
+
+        # Compare
+        self.SetComparisonInProgress(True)
+        ComparisonThreadInst = ComparisonThread(Inputs[0], Inputs[1], Algorithm=self.AlgorithmComboBox.currentText(), IgnoreSingleFileNames=IgnoreNames, Settings=Settings, AdditionalInputs=Inputs[2:])
+        self.StartComparisonThread(ComparisonThreadInst)
+
+    def ExportManifest(self):
+        if self.ComparisonInProgress:
+            return
+
+        # Validate Input
+        Input = self.FileOneLineEdit.text()
+        if Input == "":
+            self.DisplayMessageBox("The first file must be selected to export its manifest.")
+            return
+        if not os.path.exists(Input):
+            self.DisplayMessageBox("The first file does not exist.", Icon=QMessageBox.Icon.Warning)
+            return
+
+        # Select Manifest File
+        ManifestFilePath = QFileDialog.getSaveFileName(caption="Export Manifest", directory=os.path.dirname(Input), filter="Text Manifests (*.md5 *.sha1 *.sha256 *.txt);;Manifest Databases (*.sqlite3 *.db);;All Files (*)")[0]
+        if ManifestFilePath == "":
+            return
+
+        # Check the Selected Algorithm Against the Manifest File's Extension
+        Algorithm = self.AlgorithmComboBox.currentText()
+        ExtensionAlgorithm = GetExtensionAlgorithm(ManifestFilePath)
+        if ExtensionAlgorithm is not None and ResolveAlgorithm(Algorithm) != ExtensionAlgorithm:
+            self.DisplayMessageBox(f"The manifest file's extension is for {ExtensionAlgorithm} digests, but {Algorithm} is selected.  Select {ExtensionAlgorithm} or choose another file name.", Icon=QMessageBox.Icon.Warning)
+            return
+
+        # Export
+        self.SetComparisonInProgress(True)
+        ComparisonThreadInst = ComparisonThread(Input, None, Algorithm=Algorithm, Settings=self.CreateHashSettings(), ManifestFilePath=ManifestFilePath, ManifestMode="Export")
+        self.StartComparisonThread(ComparisonThreadInst)
+
+    def CompareWithManifest(self, ManifestMode="Compare"):
+        if self.ComparisonInProgress:
+            return
+
+        # Validate Input
+        Input = self.FileOneLineEdit.text()
+        if Input == "":
+            self.DisplayMessageBox("The first file must be selected to compare with a manifest.")
+            return
+        if not os.path.exists(Input):
+            self.DisplayMessageBox("The first file does not exist.", Icon=QMessageBox.Icon.Warning)
+            return
+
+        # Select Manifest File
+        ManifestFilePath = QFileDialog.getOpenFileName(caption="Select Manifest", directory=os.path.dirname(Input), filter="Manifest Files (*.md5 *.sha1 *.sha256 *.txt *.sqlite3 *.db);;All Files (*)")[0]
+        if ManifestFilePath == "":
+            return
+
+        # Check Whether to Ignore File Names
+        IgnoreNames = self.FileModeRadioButton.isChecked() and self.IgnoreNamesInFileModeCheckBox.isChecked()
+
+        # Compare
+        self.SetComparisonInProgress(True)
+        ComparisonThreadInst = ComparisonThread(Input, None, IgnoreSingleFileNames=IgnoreNames, Settings=self.CreateHashSettings(), ManifestFilePath=ManifestFilePath, ManifestMode=ManifestMode)
+        self.StartComparisonThread(ComparisonThreadInst)
+
+    def CreateHashSettings(self):
+        DigestCachePath = self.GetResourcePath("Configs/DigestCache.sqlite3") if self.UseDigestCacheCheckBox.isChecked() else None
+        MaxBytesPerSecond = self.MaxSpeedSpinBox.value() * 1000000 if self.MaxSpeedSpinBox.value() > 0 else None
+        return HashSettings(Workers=self.WorkersSpinBox.value(), DigestCachePath=DigestCachePath, MaxBytesPerSecond=MaxBytesPerSecond, UseLowIOPriority=self.LowIOPriorityCheckBox.isChecked())
+
+    def StartComparisonThread(self, ComparisonThreadInst):
+        self.CurrentComparisonThread = ComparisonThreadInst
         ComparisonThreadInst.ComparisonDoneSignal.connect(lambda: self.DisplayResult(ComparisonThreadInst))
+        ComparisonThreadInst.ProgressSignal.connect(self.UpdateProgress)
         ComparisonThreadInst.start()
 
-        # Set Up Status Checking
-        while threading.active_count() < 4 and not ComparisonThreadInst.ComparisonDone:
-            pass
-        try:
-            HashThreadOne = [RunningThread for RunningThread in threading.enumerate() if RunningThread.name == "HashThreadOne"][0]
-            HashThreadTwo = [RunningThread for RunningThread in threading.enumerate() if RunningThread.name == "HashThreadTwo"][0]
-        except IndexError:
-            HashThreadOne = None
-            HashThreadTwo = None
-        if HashThreadOne is not None and HashThreadTwo is not None:
-            StatusThreadInst = StatusThread(HashThreadOne, HashThreadTwo)
-            StatusThreadInst.UpdateProgressSignal.connect(lambda: self.UpdateProgress(HashThreadOne, HashThreadTwo))
-            StatusThreadInst.start()
-
     def DisplayResult(self, ComparisonThread):
         # Clear In-Progress
         self.SetComparisonInProgress(False)
@@ -314,28 +506,84 @@ class MainWindow(QMainWindow):
         # Get Result
         FilesIdentical = ComparisonThread.Result
 
+        # Display Stopped Comparison
+        if ComparisonThread.Cancelled:
+            self.DisplayMessageBox("Comparison stopped.")
+            return
+
+        # Display Reading Error
+        if ComparisonThread.ErrorMessage is not None:
+            self.DisplayMessageBox(f"An error occurred.  {ComparisonThread.ErrorMessage}", Icon=QMessageBox.Icon.Warning)
+            return
+
+        # Display Exported Manifest
+        if ComparisonThread.ManifestMode == "Export":
+            if FilesIdentical is None:
+                self.DisplayMessageBox("An error occurred.  The manifest was not exported.", Icon=QMessageBox.Icon.Warning)
+            else:
+                self.DisplayMessageBox(f"Manifest of {len(FilesIdentical['Files'])} files exported.")
+            return
+
+        # Get Mismatch Details
+        MismatchDetails = ""
+        DetailedText = None
+        ReuseDetails = ""
+        if isinstance(FilesIdentical, dict) and "Rehashed" in FilesIdentical:
+            ReuseDetails = f"\n\n{FilesIdentical['Rehashed']} files rehashed, {FilesIdentical['Reused']} digests reused from the manifest."
+        if isinstance(FilesIdentical, dict) and "Groups" in FilesIdentical:
+            Groups = FilesIdentical["Groups"]
+            MismatchDetails = f"\n\nInputs form {len(Groups)} groups of identical inputs."
+            DetailedText = "\n\n".join([f"Group {GroupIndex + 1}:\n" + "\n".join(Group) for GroupIndex, Group in enumerate(Groups)])
+            FilesIdentical = FilesIdentical["Identical"]
+        elif isinstance(FilesIdentical, dict) and "Changed" in FilesIdentical:
+            AddedFiles = FilesIdentical["Added"]
+            RemovedFiles = FilesIdentical["Removed"]
+            ChangedFiles = FilesIdentical["Changed"]
+            RenamedFiles = FilesIdentical.get("Renamed", {})
+            MovedFiles = FilesIdentical.get("Moved", {})
+            MismatchDetails = f"\n\n{len(AddedFiles)} added, {len(RemovedFiles)} removed, {len(ChangedFiles)} changed" + (f", {len(RenamedFiles)} renamed, {len(MovedFiles)} moved." if "Renamed" in FilesIdentical else ".")
+            MismatchedRanges = FilesIdentical.get("MismatchedRanges", {})
+            DetailedText = "\n".join([f"Added:  {File}" for File in AddedFiles] + [f"Removed:  {File}" for File in RemovedFiles] + [f"Changed:  {File}" + (" (" + ", ".join(f"bytes {Start}-{End - 1}" for Start, End in MismatchedRanges[File]) + ")" if File in MismatchedRanges else "") for File in ChangedFiles] + [f"Renamed:  {OldFile} -> {NewFile}" for OldFile, NewFile in RenamedFiles.items()] + [f"Moved:  {OldFile} -> {NewFile}" for OldFile, NewFile in MovedFiles.items()])
+            FilesIdentical = FilesIdentical["Identical"]
+        elif isinstance(FilesIdentical, dict) and "Reason" in FilesIdentical:
+            if FilesIdentical["Reason"] is not None:
+                MismatchDetails = "\n\n" + FilesIdentical["Reason"]
+            FilesIdentical = FilesIdentical["Identical"]
+        elif isinstance(FilesIdentical, dict):
+            MismatchFile = FilesIdentical["File"]
+            MismatchOffset = FilesIdentical["Offset"]
+            if MismatchFile is not None:
+                MismatchDetails = f"\n\nFirst difference:  {MismatchFile}" + ("" if MismatchOffset is None else f" at byte {MismatchOffset}")
+            FilesIdentical = FilesIdentical["Identical"]
+
         # Display Result
         if FilesIdentical is None:
             self.DisplayMessageBox("An error occurred.  Files were not compared.", Icon=QMessageBox.Icon.Warning)
         elif FilesIdentical:
-            self.DisplayMessageBox("Files are identical!")
+            self.DisplayMessageBox(f"Files are identical!{ReuseDetails}")
         else:
-            self.DisplayMessageBox("Files are not identical!", Icon=QMessageBox.Icon.Warning)
+            self.DisplayMessageBox(f"Files are not identical!{MismatchDetails}{ReuseDetails}", Icon=QMessageBox.Icon.Warning, DetailedText=DetailedText)
 
     # Interface Methods
-    def DisplayMessageBox(self, Message, Icon=QMessageBox.Icon.Information, Buttons=QMessageBox.StandardButton.Ok, Parent=None):
+    def DisplayMessageBox(self, Message, Icon=QMessageBox.Icon.Information, Buttons=QMessageBox.StandardButton.Ok, Parent=None, DetailedText=None):
         MessageBox = QMessageBox(self if Parent is None else Parent)
         MessageBox.setWindowIcon(self.WindowIcon)
         MessageBox.setWindowTitle(self.ScriptName)
         MessageBox.setIcon(Icon)
         MessageBox.setText(Message)
         MessageBox.setStandardButtons(Buttons)
+        if DetailedText:
+            MessageBox.setDetailedText(DetailedText)
         return MessageBox.exec()
 
     def SetComparisonInProgress(self, ComparisonInProgress):
         self.ComparisonInProgress = ComparisonInProgress
         for Widget in self.DisableList:
             Widget.setDisabled(ComparisonInProgress)
+        self.AlgorithmComboBox.setDisabled(ComparisonInProgress or self.MethodComboBox.currentText() == "Byte-for-Byte")
+        self.PauseButton.setEnabled(ComparisonInProgress)
+        self.PauseButton.setText("Pause")
+        self.StopButton.setEnabled(ComparisonInProgress)
         if ComparisonInProgress:
             self.StatusBar.showMessage("Comparison in progress...")
         else:
@@ -343,13 +591,38 @@ class MainWindow(QMainWindow):
             self.FileOneProgressBar.reset()
             self.FileTwoProgressBar.reset()
 
-    def UpdateProgress(self, HashThreadOne, HashThreadTwo):
-        if HashThreadOne.InputSize <= 0 or HashThreadTwo.InputSize <= 0:
+    def TogglePause(self):
+        if not self.ComparisonInProgress:
+            return
+        CancellationTokenInst = self.CurrentComparisonThread.CancellationTokenInst
+        if CancellationTokenInst.Paused:
+            CancellationTokenInst.Resume()
+            self.PauseButton.setText("Pause")
+            self.StatusBar.showMessage("Comparison in progress...")
+        else:
+            CancellationTokenInst.Pause()
+            self.PauseButton.setText("Resume")
+            self.StatusBar.showMessage("Comparison paused.")
+
+    def StopComparison(self):
+        if not self.ComparisonInProgress:
+            return
+        self.CurrentComparisonThread.CancellationTokenInst.Cancel()
+        self.PauseButton.setDisabled(True)
+        self.StopButton.setDisabled(True)
+        self.StatusBar.showMessage("Stopping comparison...")
+
+    def UpdateProgress(self, Progress):
+        if not self.ComparisonInProgress or self.CurrentComparisonThread.CancellationTokenInst.Paused or self.CurrentComparisonThread.CancellationTokenInst.Cancelled:
             return
-        HashThreadOneProgress = floor((HashThreadOne.HashedBytes / HashThreadOne.InputSize) * 100)
-        HashThreadTwoProgress = floor((HashThreadTwo.HashedBytes / HashThreadTwo.InputSize) * 100)
-        self.FileOneProgressBar.setValue(HashThreadOneProgress)
-        self.FileTwoProgressBar.setValue(HashThreadTwoProgress)
+        for InputProgress, ProgressBar in zip(Progress, (self.FileOneProgressBar, self.FileTwoProgressBar)):
+            if InputProgress["TotalBytes"] > 0:
+                ProgressBar.setValue(floor((InputProgress["HashedBytes"] / InputProgress["TotalBytes"]) * 100))
+        CurrentFile = Progress[0]["CurrentFile"]
+        FilesDone = sum(InputProgress["FilesDone"] for InputProgress in Progress)
+        TotalFiles = sum(InputProgress["TotalFiles"] for InputProgress in Progress)
+        if CurrentFile is not None:
+            self.StatusBar.showMessage(f"Comparison in progress...  {FilesDone} of {TotalFiles} files done.  Current file:  {CurrentFile}")
 
     # Window Management Methods
     def Center(self):
@@ -511,6 +784,7 @@ class MainWindow(QMainWindow):
     def closeEvent(self, event):
         if self.ComparisonInProgress:
             if self.DisplayMessageBox("A comparison is in progress.  Exit anyway?", Icon=QMessageBox.Icon.Question, Buttons=(QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)) == QMessageBox.StandardButton.Yes:
+                self.CurrentComparisonThread.CancellationTokenInst.Cancel()
                 self.SaveConfigs()
                 event.accept()
             else:
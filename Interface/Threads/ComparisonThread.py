@@ -2,18 +2,35 @@ import threading
 
 from PyQt6 import QtCore
 
-from Core.HashAndCompareInputFiles import HashAndCompareInputFiles
+from Core.CancellationToken import CancellationToken, ComparisonCancelled
+from Core.CompareInputs import CompareInputs
+from Core.HashAndCompareManyInputs import HashAndCompareManyInputs
+from Core.HashSettings import HashSettings
+from Core.ManifestFiles import CompareInputToManifest, ExportManifest, UpdateManifest
+from Core.RateLimiter import SetLowIOPriority
 
 
 class ComparisonThread(QtCore.QObject):
     ComparisonDoneSignal = QtCore.pyqtSignal()
+    ProgressSignal = QtCore.pyqtSignal(object)
 
-    def __init__(self, InputOne, InputTwo, Algorithm=None, IgnoreSingleFileNames=False):
+    def __init__(self, InputOne, InputTwo, Algorithm=None, IgnoreSingleFileNames=False, Method="Hash", Settings=None, AdditionalInputs=(), ManifestFilePath=None, ManifestMode="Compare"):
         super().__init__()
         self.InputOne = InputOne
         self.InputTwo = InputTwo
         self.Algorithm = Algorithm
         self.IgnoreSingleFileNames = IgnoreSingleFileNames
+        self.Method = Method
+        self.AdditionalInputs = list(AdditionalInputs)
+        self.ManifestFilePath = ManifestFilePath
+        self.ManifestMode = ManifestMode
+        self.Settings = Settings if Settings is not None else HashSettings()
+        self.Settings.ProgressCallback = self.ProgressSignal.emit
+        if self.Settings.CancellationTokenInst is None:
+            self.Settings.CancellationTokenInst = CancellationToken()
+        self.CancellationTokenInst = self.Settings.CancellationTokenInst
+        self.Cancelled = False
+        self.ErrorMessage = None
         self.Result = None
         self.Thread = threading.Thread(target=self.run, daemon=True)
         self.ComparisonDone = False
@@ -22,6 +39,26 @@ class ComparisonThread(QtCore.QObject):
         self.Thread.start()
 
     def run(self):
-        self.Result = HashAndCompareInputFiles(self.InputOne, self.InputTwo, Algorithm=self.Algorithm, IgnoreSingleFileNames=self.IgnoreSingleFileNames)
-        self.ComparisonDone = True
-        self.ComparisonDoneSignal.emit()
+        if self.Settings.UseLowIOPriority:
+            SetLowIOPriority()
+        try:
+            if self.ManifestFilePath is not None and self.ManifestMode == "Export":
+                self.Result = ExportManifest(self.InputOne, self.ManifestFilePath, Algorithm=self.Algorithm, Settings=self.Settings)
+            elif self.ManifestFilePath is not None and self.ManifestMode == "Update":
+                self.Result = UpdateManifest(self.InputOne, self.ManifestFilePath, IgnoreSingleFileNames=self.IgnoreSingleFileNames, Settings=self.Settings)
+            elif self.ManifestFilePath is not None:
+                self.Result = CompareInputToManifest(self.InputOne, self.ManifestFilePath, IgnoreSingleFileNames=self.IgnoreSingleFileNames, Settings=self.Settings)
+            elif self.AdditionalInputs:
+                self.Result = HashAndCompareManyInputs([self.InputOne, self.InputTwo] + self.AdditionalInputs, Algorithm=self.Algorithm, IgnoreSingleFileNames=self.IgnoreSingleFileNames, Settings=self.Settings)
+            else:
+                self.Result = CompareInputs(self.InputOne, self.InputTwo, Method=self.Method, Algorithm=self.Algorithm, IgnoreSingleFileNames=self.IgnoreSingleFileNames, Settings=self.Settings)
+        except ComparisonCancelled:
+            self.Cancelled = True
+            self.Result = None
+        except (OSError, ValueError) as Error:
+            # Unreadable inputs and damaged archives end the comparison with an error instead of leaving it in progress
+            self.ErrorMessage = str(Error)
+            self.Result = None
+        finally:
+            self.ComparisonDone = True
+            self.ComparisonDoneSignal.emit()